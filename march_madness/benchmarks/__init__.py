@@ -0,0 +1,9 @@
+"""
+Benchmarks for the load, link, search & web paths
+
+    python -m march_madness.benchmarks                   # report wall time, per-call latency & peak memory
+    python -m march_madness.benchmarks --save-baseline   # ...and save the results as the baseline
+    python -m march_madness.benchmarks --compare         # ...and fail if anything regressed vs the baseline
+
+Run from the repository root, the bracket data is found relative to the working directory.
+"""
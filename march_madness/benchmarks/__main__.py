@@ -0,0 +1,43 @@
+import argparse
+import os
+import sys
+
+from . import suite
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m march_madness.benchmarks", description="Benchmarks for the load, link, search & web paths")
+    parser.add_argument("--repeat", type=int, default=5, help="# of times each benchmark's calls are run")
+    parser.add_argument("--only", nargs="+", metavar="NAME", help="run only these benchmarks")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline file (default: %(default)s)")
+    parser.add_argument("--save-baseline", action="store_true", help="save the results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="exit w/ status 1 if a benchmark regressed vs the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown / memory growth (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    benchmarks = suite.get_benchmarks()
+    if args.only:
+        benchmarks = [benchmark for benchmark in benchmarks if benchmark.name in args.only]
+    results = suite.run_benchmarks(benchmarks, args.repeat)
+
+    baseline = suite.load_baseline(args.baseline) if os.path.exists(args.baseline) else None
+    print(suite.format_report(results, baseline))
+    if args.save_baseline:
+        suite.save_baseline(args.baseline, results)
+        print(f"\nSaved baseline to {args.baseline}")
+    elif args.compare:
+        if baseline is None:
+            print(f"\nNo baseline at {args.baseline}, run w/ --save-baseline first")
+            return 1
+        regressions = suite.compare_to_baseline(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,236 @@
+import contextlib
+import gc
+import json
+import math
+import os
+import platform
+import time
+import tracemalloc
+
+from ..models import search, store
+
+
+MIN_REPEAT_SECONDS = 0.05  # fast benchmarks are repeated until a timed repeat takes this long
+MAX_PASSES = 200
+MIN_PEAK_GROWTH_KIB = 64
+
+
+class Benchmark(object):
+
+    """
+    A named set of calls timed together
+     - make_calls builds the calls to time (untimed), e.g. loading fresh games for the linker to work on
+     - before_call runs untimed before every call, e.g. to clear the result caches so every call is cold
+    """
+
+    def __init__(self, name: str, make_calls, before_call=None):
+        """
+        :param name: str | benchmark name, used as the key in reports & baselines
+        :param make_calls: callable returning a list of callables taking no arguments
+        :param before_call: callable taking no arguments, or None
+        """
+        self.name = name
+        self.make_calls = make_calls
+        self.before_call = before_call
+
+    def run(self, repeat: int = 5) -> dict:
+        """
+        Runs the calls once untimed (to warm up imports, templates etc.), times every call over repeat runs,
+        then runs the calls once more under tracemalloc for their peak memory
+         - fast call sets are run several times per repeat, so each repeat takes at least MIN_REPEAT_SECONDS
+        :param repeat: int | # of times the full set of calls is timed
+        :return: dict | calls, wall_ms & best_ms (median & min time for all calls over repeats), mean_ms, p50_ms, p95_ms, p99_ms (per call), peak_kib
+        """
+        warm_up = sum(self.run_calls(self.make_calls()))
+        passes = min(max(math.ceil(MIN_REPEAT_SECONDS / max(warm_up, 1e-9)), 1), MAX_PASSES)
+        latencies = []
+        walls = []
+        for _ in range(repeat):
+            timings = []
+            for _ in range(passes):
+                calls = self.make_calls()
+                gc.disable()  # like timeit, keep collections of earlier garbage out of the timings
+                try:
+                    timings.extend(self.run_calls(calls))
+                finally:
+                    gc.enable()
+            latencies.extend(timings)
+            walls.append(sum(timings) / passes)
+
+        calls = self.make_calls()
+        gc.collect()
+        tracemalloc.start()  # slows calls down, so memory is measured in its own pass
+        self.run_calls(calls)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        latencies.sort()
+        return {
+            "calls": len(latencies) // (repeat * passes),
+            "wall_ms": 1000 * sorted(walls)[len(walls) // 2],
+            "best_ms": 1000 * min(walls),
+            "mean_ms": 1000 * sum(latencies) / len(latencies),
+            "p50_ms": 1000 * percentile(latencies, 50),
+            "p95_ms": 1000 * percentile(latencies, 95),
+            "p99_ms": 1000 * percentile(latencies, 99),
+            "peak_kib": peak / 1024,
+        }
+
+
+    def run_calls(self, calls: list) -> list[float]:
+        """
+        :return: list of float | seconds taken by each call, before_call excluded
+        """
+        timings = []
+        for call in calls:
+            if self.before_call is not None:
+                self.before_call()
+            start = time.perf_counter()
+            call()
+            timings.append(time.perf_counter() - start)
+        return timings
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    """
+    :param sorted_values: list of numbers, sorted low -> high
+    :param p: float | percentile, 0 - 100
+    :return: nearest-rank percentile
+    """
+    rank = max(math.ceil(p / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+BFS_TEAMS = ("Duke", "Kentucky", "Rutgers", "UMBC")
+BFS_SEEDS = (1, 5, 12, 16)
+WEB_TEAMS = ("Duke", "Kentucky", "Rutgers", "UMBC", "North Carolina", "Villanova")
+
+
+def get_benchmarks() -> list[Benchmark]:
+    """
+    :return: list of Benchmark | load, link, search & web paths, in the order they run
+    """
+    years = search.get_tournament_years()
+
+    def fresh_games():
+        return search.load_all_data()
+
+    def link_each_year():
+        games_by_year = fresh_games()
+        return [lambda year=year: search.trawl_graph(games_by_year[year], year) for year in games_by_year]
+
+    def bfs_calls(**query):
+        graphs = store.get_store().graphs
+        return [lambda year=year, graph=graph: graph.bfs(year, **query) for year, graph in graphs.items()]
+
+    benchmarks = [
+        Benchmark("load_all_data", lambda: [search.load_all_data]),
+        Benchmark("load_data_for_year", lambda: [lambda year=year: search.load_data_for_year(year) for year in years]),
+        Benchmark("construct_graphs", lambda: [lambda games_by_year=fresh_games(): search.construct_graphs(games_by_year)]),
+        Benchmark("trawl_graph", link_each_year),
+        Benchmark("bfs_team", lambda: [call for team in BFS_TEAMS for call in bfs_calls(team=team)]),
+        Benchmark("bfs_seed", lambda: [call for seed in BFS_SEEDS for call in bfs_calls(seed=seed)]),
+        Benchmark("search_for_team", lambda: [lambda team=team: search.search_for_team(team) for team in WEB_TEAMS],
+                  search.clear_result_caches),
+        Benchmark("search_for_seed", lambda: [lambda seed=seed: search.search_for_seed(seed) for seed in range(1, 17)],
+                  search.clear_result_caches),
+    ]
+    return benchmarks + get_web_benchmarks()
+
+
+def get_web_benchmarks() -> list[Benchmark]:
+    """
+    :return: list of Benchmark | result routes through the Flask test client, empty if the app can't be imported
+    """
+    try:
+        from ..web import app as web_app
+    except (ImportError, OSError) as e:  # flask not installed or web/keys.txt missing
+        print(f"[benchmarks] Skipping web benchmarks: {e}")
+        return []
+    client = web_app.app.test_client()
+
+    def clear_caches():
+        search.clear_result_caches()
+        web_app.page_cache.clear()
+
+    def get(url: str):
+        response = client.get(url)
+        assert response.status_code == 200, f"{url} returned {response.status_code}"
+
+    def team_calls():
+        return [lambda team=team: get(f"/team/result/{team}") for team in WEB_TEAMS]
+
+    def seed_calls():
+        return [lambda seed=seed: get(f"/seed/result/{seed}") for seed in range(1, 17)]
+
+    return [
+        Benchmark("web_team_result", team_calls, clear_caches),
+        Benchmark("web_seed_result", seed_calls, clear_caches),
+        Benchmark("web_team_result_cached", team_calls),
+        Benchmark("web_seed_result_cached", seed_calls),
+    ]
+
+
+def run_benchmarks(benchmarks: list[Benchmark], repeat: int = 5) -> dict:
+    """
+    Runs each benchmark w/ everything the code under test prints discarded
+    :return: dict | { benchmark name : results (see Benchmark.run) }
+    """
+    results = dict()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        store.get_store()  # build the shared store up front, so no benchmark pays for it
+        for benchmark in benchmarks:
+            results[benchmark.name] = benchmark.run(repeat)
+    return results
+
+
+def save_baseline(path: str, results: dict):
+    with open(path, "w") as f:
+        json.dump({"python": platform.python_version(), "machine": platform.machine(), "results": results}, f, indent=2)
+
+
+def load_baseline(path: str) -> dict:
+    """
+    :return: dict | { benchmark name : results } from a saved baseline
+    """
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def compare_to_baseline(results: dict, baseline: dict, tolerance: float = 0.25) -> list[str]:
+    """
+    Finds benchmarks that got slower or use more memory than the baseline
+     - compares the best time for all calls, single calls & medians are too noisy for microsecond lookups
+     - memory growth under MIN_PEAK_GROWTH_KIB is ignored, small peaks vary w/ allocator & cache state
+    :param tolerance: float | allowed slowdown / growth, 0.25 == 25%
+    :return: list of str | one message per regression, empty if none
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:  # new benchmark
+            continue
+        for metric in ("best_ms", "peak_kib"):
+            if metric not in previous:
+                continue
+            if metric == "peak_kib" and current[metric] - previous[metric] < MIN_PEAK_GROWTH_KIB:
+                continue
+            if current[metric] > previous[metric] * (1 + tolerance):
+                change = 100 * (current[metric] / previous[metric] - 1)
+                regressions.append(f"{name} {metric}: {previous[metric]:.3f} -> {current[metric]:.3f} (+{change:.0f}%)")
+    return regressions
+
+
+def format_report(results: dict, baseline: dict = None) -> str:
+    """
+    :return: str | one row per benchmark, w/ the change in best time when a baseline is given
+    """
+    header = f"{'benchmark':<24} {'calls':>6} {'wall ms':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak KiB':>10}"
+    lines = [header + ("   vs baseline" if baseline else ""), "-" * len(header)]
+    for name, r in results.items():
+        line = (f"{name:<24} {r['calls']:>6} {r['wall_ms']:>10.3f} {r['p50_ms']:>9.3f} {r['p95_ms']:>9.3f} "
+                f"{r['p99_ms']:>9.3f} {r['peak_kib']:>10.1f}")
+        if baseline and "best_ms" in baseline.get(name, dict()):  # older baselines may lack the metric
+            line += f"   {100 * (r['best_ms'] / baseline[name]['best_ms'] - 1):+.0f}%"
+        lines.append(line)
+    return "\n".join(lines)
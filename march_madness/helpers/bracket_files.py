@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+from collections import OrderedDict
+
+from . import bracket_parsing as bp
+from . import metrics
+
+
+GAME_FIELDS = ("year", "tourney_round", "teams", "seeds", "scores")  # one JSON line per game, in this key order
+
+
+def serialize_games(games: list) -> bytes:
+    """
+    Formats a year's games as a structured bracket file
+    :param games: list of dict (or MarchMadnessItem) | keys as in GAME_FIELDS, in bracket order
+    :return: bytes | JSON lines, one game per line
+    """
+    lines = [json.dumps({field: game[field] for field in GAME_FIELDS}) for game in games]
+    return "".join(f"{line}\n" for line in lines).encode("utf-8")
+
+
+def write_atomic(path: str, content: bytes):
+    """
+    Writes a file via temp file + rename, so readers see either the old or the new file, never part of one
+     - the temp file has a unique name, so processes writing the same file at once (e.g. cold starts) don't collide
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=f"{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.chmod(tmp_path, 0o644)  # mkstemp creates files readable by the owner only
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def read_bracket_file(path: str) -> OrderedDict:
+    """
+    Reads a bracket file in either format
+     - structured: one JSON game per line, already normalized by the spider -> no HTML parsing
+     - legacy: one JSON object of { round title : [raw <li> html] }, cleaned & parsed here
+    :param path: bracket_{year}.jl file
+    :return: ordered dict | { round title : [[(seed, name, score)] per game] } in bracket order
+    """
+    with open(path) as f:
+        with metrics.stage("load_json"):
+            first_line = f.readline()
+            data = json.loads(first_line)
+        rounds = OrderedDict()
+        if "teams" not in data:  # legacy file, single line
+            with metrics.stage("clean_html"):
+                for tourney_round, game_data in data.items():
+                    parsed = (bp.parse_game(html) for html in game_data)
+                    rounds[tourney_round] = [teams for teams in parsed if teams is not None]  # skip region headers
+            return rounds
+        with metrics.stage("load_json"):
+            for line in [first_line] + f.readlines():
+                game = json.loads(line)
+                teams = list(zip(game["seeds"], game["teams"], game["scores"]))
+                rounds.setdefault(game["tourney_round"], []).append(teams)
+        return rounds
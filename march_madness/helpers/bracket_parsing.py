@@ -0,0 +1,74 @@
+"""
+Parsing of the raw <li> games in the bracket files
+ - every pattern is compiled once at import & shared by every game & team parsed
+ - a game still takes a few short passes (markup, leading text, OT suffix, split into teams, then seed & score per team),
+   not a single scan, each over a string of ~100 characters
+"""
+
+import re
+
+MARKUP = re.compile(r"<.*?>|\u00a0|&amp;")  # html tags, non-breaking spaces & escaped ampersands
+MARKUP_REPLACEMENTS = {"\u00a0": " ", "&amp;": "&"}  # any other match is a tag -> removed
+LEADING_TEXT = re.compile(r"^.*?No\.")  # region labels etc. before the first seed (e.g. "East: No. 16 ...")
+OVERTIME = re.compile(r" \([\d]?OT\)$")  # e.g. " (OT)" or " (2OT)"
+SECOND_TEAM = re.compile(r"No.")  # start of a seeded team, used when the comma between teams is missing
+SCORE = re.compile(r"(\d+)$")  # last numerical instance
+SEED = re.compile(r"(\d+)[A-Z]? ")  # first numerical instance, some seeds have a letter at the end (e.g. 2Q)
+
+
+def replace_markup(match) -> str:
+    return MARKUP_REPLACEMENTS.get(match.group(0), "")
+
+
+def clean_game_html(html: str) -> str:
+    """
+    Strips the markup around a raw <li> game so only the teams & scores remain
+    :param html: raw <li> string from a bracket file
+    :return: str | e.g. "No. 16 North Dakota State 78, No. 16 N.C. Central 74", None for region headers
+    """
+    if "\n\t\t\t" in html:  # region header wrapping a nested list of games
+        return None
+    text = MARKUP.sub(replace_markup, html)
+    text = text.split("|")[0].strip()
+    text = LEADING_TEXT.sub("No.", text)
+    return OVERTIME.sub("", text)
+
+
+def split_game_text(text: str) -> list[str]:
+    """
+    Splits a cleaned game into the text for each team
+    :param text: cleaned game, e.g. "No. 6 Rutgers 64, No. 3 Marquette 60"
+    :return: list of str | one entry per team
+    """
+    if "," in text:
+        return [team.strip() for team in text.split(",")]
+    # error, no comma in input -> second team starts at the second seed
+    i = [match.start() for match in SECOND_TEAM.finditer(text)][1]
+    return [text[:i-1].strip(), text[i:].strip()]
+
+
+def parse_team(text: str) -> tuple:
+    """
+    Parses a single team's text into its fields
+    :param text: e.g. "No. 16 North Dakota State 78"
+    :return: tuple(seed: int, name: str, score: int) | seed is -1 when missing, score is 0 when missing
+    """
+    score_match = SCORE.search(text)
+    seed_match = SEED.search(text)
+    score = 0 if score_match is None else int(score_match.group(1))
+    seed = -1 if seed_match is None else int(seed_match.group(1))
+    start_i = 0 if seed_match is None else seed_match.end()
+    end_i = len(text) if score_match is None else score_match.start()-1
+    return seed, text[start_i:end_i], score  # name is between seed & score
+
+
+def parse_game(html: str) -> list[tuple]:
+    """
+    Parses a raw <li> game into its teams: clean_game_html -> split_game_text -> parse_team for each team
+    :param html: raw <li> string from a bracket file
+    :return: list of tuple(seed, name, score) | one per team, None for region headers
+    """
+    text = clean_game_html(html)
+    if text is None:
+        return None
+    return [parse_team(team) for team in split_game_text(text)]
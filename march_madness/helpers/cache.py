@@ -0,0 +1,79 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+UNCHANGED = object()  # default for configure() arguments that are left as they are
+
+class LRUCache(object):
+    """
+    Bounded, thread-safe least-recently-used cache w/ an optional time-to-live
+     - callers key entries on the formatted query, so " rutgers" & "RUTGERS " share an entry
+     - hits & misses are counted for monitoring
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = None):
+        """
+        :param maxsize: int | max # of entries, least recently used entries are evicted first
+        :param ttl: float | seconds an entry stays valid, None to keep entries until evicted or cleared
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (expiry time, value)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def configure(self, maxsize: int = None, ttl: float = UNCHANGED):
+        """
+        Updates the size and/or TTL, dropping all entries
+        :param maxsize: int | max # of entries, None to keep the current size
+        :param ttl: float | seconds an entry stays valid, None to keep entries until evicted or cleared (as in the constructor),
+            left as is if not passed
+        """
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if ttl is not UNCHANGED:
+                self.ttl = ttl
+            self._entries.clear()
+
+    def get(self, key, default=None):
+        """
+        :param key: cache key
+        :param default: returned on a miss
+        :return: cached value, or default if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+                self._entries.move_to_end(key)  # mark as most recently used
+                self.hits += 1
+                return entry[1]
+            if entry is not None:  # expired
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        expiry = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = (expiry, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)  # evict least recently used
+
+    def clear(self):
+        """
+        Drops all entries (e.g. when the bracket data is reloaded), counters are kept
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize, "ttl": self.ttl}
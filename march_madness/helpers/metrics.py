@@ -0,0 +1,180 @@
+"""
+Opt-in timings of the stages behind each result (JSON loading, HTML cleanup, linking, BFS, searching, rendering)
+ - off unless MARCH_MADNESS_METRICS=1 is set or enable() is called, when off stage() hands back a shared no-op timer
+ - each stage feeds a latency histogram, exposed in Prometheus text format by render() (served at /metrics)
+ - stages timed while handling a web request are also collected per request, for the Server-Timing header
+"""
+
+import bisect
+import contextvars
+import os
+import threading
+import time
+
+
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)  # seconds
+PREFIX = "march_madness"
+
+enabled = os.environ.get("MARCH_MADNESS_METRICS", "") in ("1", "true")
+histograms = dict()  # stage -> Histogram
+counters = dict()  # tuple(name, labels) -> int, labels are a sorted tuple of (label, value)
+_lock = threading.Lock()
+_request_timings = contextvars.ContextVar("request_timings", default=None)  # [(stage, seconds)] for the current request
+
+
+class Histogram(object):
+
+    def __init__(self, buckets: tuple = BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last count is for values above every bucket (+Inf)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class StageTimer(object):
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class NoopTimer(object):
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NOOP_TIMER = NoopTimer()
+
+
+def enable(on: bool = True):
+    global enabled
+    enabled = on
+
+
+def reset():
+    """
+    Drops everything recorded so far
+    """
+    with _lock:
+        histograms.clear()
+        counters.clear()
+
+
+def stage(name: str):
+    """
+    Times the body of a with block as a stage, e.g. with metrics.stage("render"): ...
+    :param name: str | stage name
+    :return: context manager
+    """
+    if not enabled:
+        return NOOP_TIMER
+    return StageTimer(name)
+
+
+def observe(name: str, seconds: float):
+    """
+    Records one timing of a stage (& adds it to the current request's timings, if any)
+    """
+    with _lock:
+        histogram = histograms.get(name)
+        if histogram is None:
+            histogram = histograms[name] = Histogram()
+        histogram.observe(seconds)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((name, seconds))
+
+
+def increment(name: str, labels: dict = None, amount: int = 1):
+    """
+    :param name: str | counter name, e.g. "requests_total"
+    :param labels: dict | label values, e.g. {"endpoint": "search_by_team"}
+    """
+    if not enabled:
+        return
+    key = (name, tuple(sorted((labels or dict()).items())))
+    with _lock:
+        counters[key] = counters.get(key, 0) + amount
+
+
+def start_request():
+    """
+    Starts collecting the stages timed while handling a request
+    """
+    _request_timings.set([])
+
+
+def finish_request() -> list[tuple]:
+    """
+    :return: list of tuple(stage, seconds) | stages timed since start_request, in the order they finished
+    """
+    timings = _request_timings.get()
+    _request_timings.set(None)
+    return timings or []
+
+
+def format_server_timing(timings: list[tuple]) -> str:
+    """
+    :param timings: list of tuple(stage, seconds), a stage timed more than once is summed
+    :return: str | Server-Timing header value, e.g. "search;dur=0.031, render;dur=1.204"
+    """
+    totals = dict()
+    for name, seconds in timings:
+        totals[name] = totals.get(name, 0.0) + seconds
+    return ", ".join(f"{name};dur={1000 * seconds:.3f}" for name, seconds in totals.items())
+
+
+def format_labels(labels) -> str:
+    """
+    :param labels: iterable of tuple(label, value)
+    :return: str | e.g. '{stage="bfs",le="0.001"}', empty if there are no labels
+    """
+    pairs = [f'{label}="{str(value)}"' for label, value in labels]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def render(extra_counters: dict = None) -> str:
+    """
+    Formats everything recorded so far in the Prometheus text exposition format
+    :param extra_counters: dict | { tuple(name, labels) : value } of counters kept elsewhere (e.g. cache hits)
+    :return: str
+    """
+    lines = []
+    with _lock:
+        if histograms:
+            metric = f"{PREFIX}_stage_seconds"
+            lines.append(f"# HELP {metric} Time spent in each stage")
+            lines.append(f"# TYPE {metric} histogram")
+            for name, histogram in sorted(histograms.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+                    cumulative += count
+                    lines.append(f"{metric}_bucket{format_labels([('stage', name), ('le', bound)])} {cumulative}")
+                lines.append(f"{metric}_sum{format_labels([('stage', name)])} {histogram.sum}")
+                lines.append(f"{metric}_count{format_labels([('stage', name)])} {histogram.count}")
+        all_counters = dict(counters)
+    all_counters.update(extra_counters or dict())
+    for name in sorted({name for name, _ in all_counters}):
+        lines.append(f"# TYPE {PREFIX}_{name} counter")
+        for (counter_name, labels), value in sorted(all_counters.items()):
+            if counter_name == name:
+                lines.append(f"{PREFIX}_{name}{format_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
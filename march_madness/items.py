@@ -7,6 +7,9 @@ import scrapy
 
 
 class MarchMadnessItem(scrapy.Item):
-    # define the fields for your item here like:
-    # name = scrapy.Field()
-    pass
+    # one tournament game, already cleaned & parsed at crawl time (see helpers/bracket_parsing.py)
+    year = scrapy.Field()
+    tourney_round = scrapy.Field()  # round title as shown on the page, e.g. "Sweet 16"
+    teams = scrapy.Field()  # team names, in the order listed
+    seeds = scrapy.Field()  # seed of each team, -1 when unseeded
+    scores = scrapy.Field()  # score of each team
@@ -1,5 +1,4 @@
-import re
-from queue import SimpleQueue
+from ..helpers import bracket_parsing as bp
 
 
 def format_round(rd: str) -> int:
@@ -41,7 +40,23 @@ def format_round_2(current_keys: list[int]) -> int:
 
 
 class Game(object):
-    children = set()  # child nodes of this game (games where teams were determined)
+    # fixed attributes -> no per-instance __dict__, keeps the ~3,400 games in memory compact
+    #  - children: tuple of child nodes of this game (games where teams were determined), empty for leaves
+    #  - parent: game the winner played next (first game in bracket order listing this one as a child), None for the championship
+    #  - _round_number: tourney_round as an int, cached for ranking results
+    __slots__ = ("teams", "children", "parent", "_tourney_round", "_round_number", "_is_championship")
+
+    def get_tourney_round(self):
+        return self._tourney_round
+
+    def set_tourney_round(self, new_value: str):
+        self._tourney_round = new_value
+        try:  # try casting round -> int
+            self._round_number = int(new_value)
+        except ValueError:
+            self._round_number = Team.RESULT_WIN_UNKNOWN_ROUND
+
+    tourney_round = property(get_tourney_round, set_tourney_round)  # round as returned by format_round
 
     def get_is_championship(self):
         return self._is_championship
@@ -74,6 +89,13 @@ class Game(object):
         loser = self.team2 if self.team1.score > self.team2.score else self.team1
         return loser
 
+    def get_round_number(self) -> int:
+        """
+        Returns the tournament round as a number for ranking results (lower is better)
+        :return: int | round (64, 32, ..., 2) or Team.RESULT_WIN_UNKNOWN_ROUND if the round is unmarked
+        """
+        return self._round_number
+
     def get_game_summary(self):
         winner = self.get_winner()
         loser = self.get_loser()
@@ -105,19 +127,31 @@ class Game(object):
         return len(self.children) == 0
 
     def __init__(self, html: str, tourney_round: str):
-        if "," in html:
-            teams = [Team(team.strip()) for team in html.split(",")]
-        else:  # error, no comma in input
-            # print(f"[Game] improper input format...{html}")
-            i = list(re.finditer("No.", html))[1].start()
-            t1 = html[:i-1].strip()
-            t2 = html[i:].strip()
-            teams = [Team(t1), Team(t2)]
+        teams = [Team(team) for team in bp.split_game_text(html)]
         self.teams = teams
+        self.children = ()
+        self.parent = None
         self.tourney_round = format_round(tourney_round)
         self._is_championship = False
         # print(f"[Team 1] {teams[0].name} vs. [Team 2] {teams[1].name}\n")
 
+    @classmethod
+    def from_parts(cls, teams: list, tourney_round: str, is_championship: bool = False):
+        """
+        Creates a Game from already parsed teams, skipping HTML parsing
+        :param teams: list of Team objects
+        :param tourney_round: str | round as returned by format_round
+        :param is_championship: whether the game is the championship
+        :return: Game
+        """
+        game = cls.__new__(cls)
+        game.teams = teams
+        game.children = ()
+        game.parent = None
+        game.tourney_round = tourney_round
+        game._is_championship = is_championship
+        return game
+
     def is_node(self, team_1: str, team_2: str):
         """
         Returns true if the two teams provided match
@@ -128,59 +162,6 @@ class Game(object):
         names = [self.team1.name, self.team2.name]
         return team_1 in names and team_2 in names
 
-    def show_levels_breadth_first(self, q: SimpleQueue, explored: set):
-        """
-        Breadth First Search through graph
-        :param q: queue containing game objects to search
-        :param explored: set containing explored objects
-        :return: concatenated str displaying full graph
-        """
-
-        q.put(self)  # add this node to queue to start
-        graph_string = ""
-        while q.qsize() > 0:  # iterate until queue is empty
-            # print(f"[bfs] Queue length: {q.qsize()} | Explored: {explored}")
-            next_item = q.get()
-            if next_item not in explored:
-                next_item.print_game_summary()  # print summary
-                graph_string += f"{next_item.get_game_summary()}\n"
-                explored.add(next_item)  # label route as explored after printing
-                if len(next_item.children) > 0:  # stop after getting to leaf
-                    for child in next_item.children:
-                        if child not in explored:
-                            q.put(child)
-                            # print(f"  added CHILD of '{self.get_game_summary()}' -> q")
-        return graph_string
-
-    def breadth_first_search(self, q: SimpleQueue, explored: set, comp) -> tuple:
-        """
-        Breadth First Search through graph
-        :param q: queue containing game objects to search
-        :param explored: set containing explored objects
-        :param comp: lambda used to check for seed or name
-        :return: tuple(round_number: int, team_name: str?) | highest matching tournament round that was WON (1000: no wins, 100: win in unknown round, ..., 2 == champs)
-        """
-
-        q.put(self)  # add this node to queue to start
-        best_round = 1000  # 1000 means no wins in tournament at any level
-        team = ""
-        while q.qsize() > 0:  # iterate until queue is empty
-            # print(f"[bfs] Queue length: {q.qsize()} | Explored: {explored}")
-            next_item = q.get()
-            if next_item not in explored:
-                # print(f"Searching node ---'{self.get_game_summary()}'---")
-                res, t = comp(next_item)  # apply lambda
-                if res < best_round:
-                    # print(f"Result: {res}")
-                    print(t)
-                    return res, t
-                explored.add(next_item)  # label route as explored after printing
-                if len(next_item.children) > 0:  # stop after getting to leaf
-                    for child in next_item.children:
-                        if child not in explored:
-                            q.put(child)
-        return best_round, team
-
 
 class Team(object):
     """
@@ -191,18 +172,21 @@ class Team(object):
     RESULT_NO_WINS = 1000  # result for never winning in tourney
     RESULT_WIN_UNKNOWN_ROUND = 100  # result for winning in unknown tourney round (i.e. not round of 64, 32, etc.)
 
+    __slots__ = ("name", "seed", "score")  # no per-instance __dict__
+
     def __init__(self, html: str):
         # print(f"Input: '{html}'")
-        score_match = re.search(r"(\d+)$", html)  # last numerical instance
-        seed_match = re.search(r"(\d+)[A-Z]? ", html)  # first numerical instance
-        self.score = 0 if score_match is None else int(score_match.group(0))
-        if seed_match is not None:
-            # some seeds have a letter at the end (e.g. 2Q), so get the number portion
-            numeric_value = re.search(r"(\d+)", seed_match.group(0)).group(0)
-            self.seed = int(numeric_value)
-        else:
-            self.seed = -1
-        start_i = 0 if seed_match is None else seed_match.end()
-        end_i = len(html) if score_match is None else score_match.start()-1
-        self.name = html[start_i:end_i]  # name is between seed & score
-        # print(f"Name: '{self.name}' | Score: {self.score} | Seed: {self.seed}")
\ No newline at end of file
+        self.seed, self.name, self.score = bp.parse_team(html)
+        # print(f"Name: '{self.name}' | Score: {self.score} | Seed: {self.seed}")
+
+    @classmethod
+    def from_parts(cls, name: str, seed: int, score: int):
+        """
+        Creates a Team from already parsed fields, skipping HTML parsing
+        :return: Team
+        """
+        team = cls.__new__(cls)
+        team.name = name
+        team.seed = seed
+        team.score = score
+        return team
@@ -1,5 +1,7 @@
-from queue import SimpleQueue
-from .game import Game, Team
+import json
+from . import traversal
+from .game import Game
+from ..helpers import metrics
 from ..helpers import string_formatting as sf
 
 class Graph(object):
@@ -8,59 +10,127 @@ class Graph(object):
     A graph maps a given tournament year against the games played in that year
     The "game_structure" is a single Game object
      - the children of the initial object contain the other nodes
+     - first_games maps each formatted team name to the first game it played, the start of its run (see team_run)
     """
 
-    def __init__(self, year: int, championship: Game):
+    def __init__(self, year: int, championship: Game, first_games: dict = None):
         self.year = year
         self.championship = championship
+        self.first_games = dict() if first_games is None else first_games
 
-    def show(self) -> str:
-        print(f"\n\n[show_graph] Year {self.year}")
-        return self.championship.show_levels_breadth_first(SimpleQueue(), set())  # ***
+    def show(self, verbose: bool = True) -> str:
+        """
+        :param verbose: print the year & every game to stdout as well
+        :return: str | summary of every game, one per line, top-down (see iter_text)
+        """
+        if verbose:
+            print(f"\n\n[show_graph] Year {self.year}")
+        chunks = []
+        for chunk in self.iter_text():
+            if verbose:
+                print(chunk, end="")
+            chunks.append(chunk)
+        return "".join(chunks)
 
-    def bfs(self, year: int, seed: int = -1, team: str = None) -> tuple:
+    def levels(self):
         """
-        Returns farthest instance for a team or seed within a given year. More effective to use BFS than DFS since we're searching top-down (higher -> lower round)
-        :return: tuple( year: int, best_result: tuple(round_number, team_name) )
+        Yields the games reachable from the championship one level at a time, in breadth first order
+         - level 0 is the championship, level n holds the children of level n - 1 not seen on an earlier level
+        :return: generator of list of Game
         """
+        level = [self.championship]
+        explored = {self.championship}
+        while len(level) > 0:
+            yield level
+            next_level = []
+            for game in level:
+                for child in game.children:
+                    if child not in explored:
+                        explored.add(child)
+                        next_level.append(child)
+            level = next_level
 
-        if team is not None:
+    def iter_text(self):
+        """
+        Serializes the bracket as text, one chunk per level
+        :return: generator of str | game summaries, one per line
+        """
+        for level in self.levels():
+            yield "".join(f"{game.get_game_summary()}\n" for game in level)
 
-            def team_search(node: Game) -> tuple:
-                """
-                Searches for nodes where the specified Team won the game
-                :param node: in game graph
-                :return: tuple(round: int, None)
-                """
+    def iter_json(self):
+        """
+        Serializes the bracket as JSON, one chunk per level
+         - {"year": year, "levels": [[game]]}, each game lists the ids of its children (ids count up in breadth first order)
+        :return: generator of str | chunks of one JSON document
+        """
+        yield f'{{"year": {self.year}, "levels": ['
+        ids = dict()  # game -> id, a level's children get ids before the level is written
+        previous = None
+        for level in self.levels():
+            for game in level:
+                ids[game] = len(ids)
+            if previous is not None:
+                yield f"{format_level_json(previous, ids)}, "
+            previous = level
+        yield f"{format_level_json(previous, ids)}]}}"
 
-                winner = node.get_winner().name
-                if sf.format_string_for_comparison(team) == sf.format_string_for_comparison(winner):
-                    print(f" ***Found matching node: {year} ---{node.get_game_summary()}---")
-                    try:  # try casting round -> int
-                        max_round = int(node.tourney_round)
-                    except ValueError:
-                        max_round = Team.RESULT_WIN_UNKNOWN_ROUND  # 100 is default
-                    return max_round, None
-                return Team.RESULT_NO_WINS, None  # none result
+    def games_breadth_first(self):
+        """
+        Yields every game reachable from the championship, top-down (higher -> lower round)
+        :return: generator of Game objects
+        """
+        yield from self.traverse(traversal.GameCollector()).games
 
-            return year, self.championship.breadth_first_search(SimpleQueue(), set(), team_search)
+    def team_run(self, team: str) -> list[Game]:
+        """
+        Returns every game a team played in the year, from its first game up to the game it was eliminated in
+         - walks up the parent links from the team's first game, so it only visits the games of the run
+        :param team: str | name
+        :return: list of Game | first -> last game, empty if the team didn't play in the year
+        """
+        query = sf.format_string_for_comparison(team)
+        game = self.first_games.get(query)
+        run = []
+        while game is not None:
+            run.append(game)
+            if sf.format_string_for_comparison(game.get_winner().name) != query:  # eliminated
+                break
+            game = game.parent
+        return run
 
-        elif seed != -1:
+    def traverse(self, visitor, order: str = traversal.BFS, max_depth: int = None):
+        """
+        Visits the games of the year from the championship down, see models/traversal.py
+        :param visitor: object w/ visit(game, depth) -> bool, True stops the traversal
+        :param order: traversal.BFS or traversal.DFS
+        :param max_depth: int | games deeper than this aren't visited (championship == depth 0), None for no limit
+        :return: visitor
+        """
+        return traversal.traverse(self.championship, visitor, order, max_depth)
+
+    def bfs(self, year: int, seed: int = -1, team: str = None) -> tuple:
+        """
+        Returns farthest instance for a team or seed within a given year. More effective to use BFS than DFS since we're searching top-down (higher -> lower round)
+        :return: tuple( year: int, best_result: tuple(round_number, team_name) )
+        """
+        with metrics.stage("bfs"):
+            if team is not None:
+                return year, self.traverse(traversal.TeamWinVisitor(team)).result
+            elif seed != -1:
+                return year, self.traverse(traversal.SeedWinVisitor(seed)).result
 
-            def seed_search(node: Game) -> tuple:
-                """
-                Searches for nodes where the specified seed WON the game
-                :param node: in game graph
-                :return: tuple(round: int, team: str)
-                """
-                winner = node.get_winner()
-                if (winner.seed != -1) and (seed == winner.seed):
-                    print(f" ***Found matching node: {year} ---{node.get_game_summary()}---")
-                    try:
-                        max_round = int(node.tourney_round)
-                    except ValueError:
-                        max_round = Team.RESULT_WIN_UNKNOWN_ROUND
-                    return max_round, winner.name  # return team for that seed
-                return Team.RESULT_NO_WINS, ""  # no win result - don't return team
 
-            return year, self.championship.breadth_first_search(SimpleQueue(), set(), seed_search)
\ No newline at end of file
+def format_level_json(level: list[Game], ids: dict) -> str:
+    """
+    :param level: games on one level of the bracket
+    :param ids: dict | { Game : id } for the games on the level & their children
+    :return: str | JSON array w/ one object per game
+    """
+    return json.dumps([{
+        "id": ids[game],
+        "round": game.tourney_round,
+        "teams": [{"seed": team.seed, "team": team.name, "score": team.score} for team in game.teams],
+        "winner": game.get_winner().name,
+        "children": [ids[child] for child in game.children],
+    } for game in level])
@@ -0,0 +1,210 @@
+import bisect
+
+from .game import Team
+from .trie import PrefixTrie
+from .trigram import TrigramIndex
+from ..helpers import string_formatting as sf
+
+
+def build_team_index(graphs: dict) -> dict:
+    """
+    Inverts the graphs into a lookup of each team's best result per year
+     - only games reachable from the championship count, matching a BFS of the graph
+     - a team's best result is the lowest round number it WON (2 == champs, 100 == win in unknown round)
+    :param graphs: dict | key = year, value = Graph
+    :return: dict | { formatted team name : { year : best_round } }
+    """
+
+    team_index = dict()
+    for year, graph in graphs.items():
+        for team, best_round in get_best_rounds(graph).items():
+            team_index.setdefault(team, dict())[year] = best_round
+    return team_index
+
+
+def get_best_rounds(graph) -> dict:
+    """
+    :param graph: Graph | one tournament year
+    :return: dict | { formatted team name : best round won in the year }
+    """
+    best_rounds = dict()
+    for game in graph.games_breadth_first():
+        team = sf.format_string_for_comparison(game.get_winner().name)
+        best_round = game.get_round_number()
+        if best_round < best_rounds.get(team, Team.RESULT_NO_WINS):
+            best_rounds[team] = best_round
+    return best_rounds
+
+
+def add_year_to_team_index(team_index: dict, year: int, graph) -> dict:
+    """
+    Adds one new year to a team index w/o changing it (readers may still be using it)
+    :return: dict | new team index, sharing the entries of teams that didn't win in the year
+    """
+    new_index = dict(team_index)
+    for team, best_round in get_best_rounds(graph).items():
+        best_by_year = dict(team_index.get(team, dict()))
+        best_by_year[year] = best_round
+        new_index[team] = best_by_year
+    return new_index
+
+
+def build_seed_index(graphs: dict) -> dict:
+    """
+    Collects the best result of every seed in one pass over each year's graph
+     - a seed's best result in a year is the lowest round number won by a team with that seed
+     - years where the seed never won a game are listed under Team.RESULT_NO_WINS w/ an empty team name
+    :param graphs: dict | key = year, value = Graph
+    :return: dict | { seed : { best_round : { team_name : [year] } } }, seeds 1-16 are always present
+    """
+
+    best_by_year = dict()  # { year : { seed : (best_round, team_name) } }
+    seeds = set(range(1, 17))
+    for year, graph in graphs.items():
+        best_by_seed = get_best_by_seed(graph)
+        best_by_year[year] = best_by_seed
+        seeds.update(best_by_seed.keys())
+
+    seed_index = dict()
+    for seed in sorted(seeds):
+        results = dict()
+        for year, best_by_seed in best_by_year.items():
+            result, team_name = best_by_seed.get(seed, (Team.RESULT_NO_WINS, ""))
+            results.setdefault(result, dict()).setdefault(team_name, []).append(year)
+        seed_index[seed] = results
+    return seed_index
+
+
+def get_best_by_seed(graph) -> dict:
+    """
+    :param graph: Graph | one tournament year
+    :return: dict | { seed : (best round won in the year, team_name) }, seeds w/o wins are missing
+    """
+    best_by_seed = dict()
+    for game in graph.games_breadth_first():
+        winner = game.get_winner()
+        if winner.seed == -1:  # unseeded tournament
+            continue
+        best_round = game.get_round_number()
+        if best_round < best_by_seed.get(winner.seed, (Team.RESULT_NO_WINS, ""))[0]:
+            best_by_seed[winner.seed] = (best_round, winner.name)
+    return best_by_seed
+
+
+def add_year_to_seed_index(seed_index: dict, year: int, graph, years: list[int]) -> dict:
+    """
+    Adds one new year to a seed index w/o changing it (readers may still be using it)
+    :param years: years already in the seed index
+    :return: dict | new seed index, year lists stay in year order
+    """
+    best_by_seed = get_best_by_seed(graph)
+    new_index = dict()
+    for seed in sorted(set(seed_index.keys()) | set(best_by_seed.keys())):
+        if seed in seed_index:
+            results = {result: {team_name: list(team_years) for team_name, team_years in years_by_team.items()}
+                       for result, years_by_team in seed_index[seed].items()}
+        else:  # first win by a new seed -> it never won in the earlier years
+            results = {Team.RESULT_NO_WINS: {"": list(years)}}
+        result, team_name = best_by_seed.get(seed, (Team.RESULT_NO_WINS, ""))
+        bisect.insort(results.setdefault(result, dict()).setdefault(team_name, []), year)
+        new_index[seed] = results
+    return new_index
+
+
+def build_name_index(games_by_year: dict) -> TrigramIndex:
+    """
+    Collects every team that played in any year (not only winners) into a fuzzy name index
+    :param games_by_year: dict | { year : { round : [Game] } }
+    :return: TrigramIndex
+    """
+    return TrigramIndex(name for games in games_by_year.values() for name in get_team_names(games))
+
+
+def get_team_names(games: dict):
+    """
+    :param games: dict | { round : [Game] } for one year
+    :return: generator of str | name of every team in every game, repeats included
+    """
+    return (team.name for level_games in games.values() for game in level_games for team in game.teams)
+
+
+def add_year_to_name_index(name_index: TrigramIndex, games: dict) -> TrigramIndex:
+    """
+    :param games: dict | { round : [Game] } for the new year
+    :return: TrigramIndex | copy of name_index that also holds the teams new in the year
+    """
+    return name_index.with_names(get_team_names(games))
+
+
+def build_name_trie(games_by_year: dict) -> PrefixTrie:
+    """
+    Counts the tournaments each team played in & builds the autocomplete trie from them
+    :param games_by_year: dict | { year : { round : [Game] } }
+    :return: PrefixTrie | completions use the first spelling seen of each name
+    """
+    names = dict()  # formatted name -> first spelling
+    years_by_team = dict()  # formatted name -> {year}
+    for year, games in games_by_year.items():
+        for name in get_team_names(games):
+            key = sf.format_string_for_comparison(name)
+            names.setdefault(key, name)
+            years_by_team.setdefault(key, set()).add(year)
+    return PrefixTrie({names[key]: len(years) for key, years in years_by_team.items()})
+
+
+def add_year_to_name_trie(name_trie: PrefixTrie, games: dict) -> PrefixTrie:
+    """
+    :param games: dict | { round : [Game] } for the new year
+    :return: PrefixTrie | copy of name_trie w/ one more appearance for every team in the year
+    """
+    names = dict()  # formatted name -> first spelling
+    for name in get_team_names(games):
+        names.setdefault(sf.format_string_for_comparison(name), name)
+    return name_trie.with_appearances({name: name_trie.get_appearances(name) + 1 for name in names.values()})
+
+
+def build_h2h_index(games_by_year: dict) -> dict:
+    """
+    Collects every tournament game by the pair of teams that played it, for head-to-head lookups
+     - covers all games in the data, including those the graph doesn't link (e.g. third-place games)
+    :param games_by_year: dict | { year : { round : [Game] } }
+    :return: dict | { (formatted team name, formatted team name) sorted : [(year, tourney_round, winner, winner_score, loser_score)] }, games in year & bracket order
+    """
+    h2h_index = dict()
+    for year, games in games_by_year.items():
+        for key, matchup in get_matchups(year, games):
+            h2h_index.setdefault(key, []).append(matchup)
+    return h2h_index
+
+
+def get_matchup_key(team_1: str, team_2: str) -> tuple:
+    """
+    :return: tuple(str, str) | formatted names in sorted order, so either team can be named first
+    """
+    return tuple(sorted((sf.format_string_for_comparison(team_1), sf.format_string_for_comparison(team_2))))
+
+
+def get_matchups(year: int, games: dict):
+    """
+    :param games: dict | { round : [Game] } for one year
+    :return: generator of tuple(key, matchup) | one per game, see build_h2h_index
+    """
+    for level_games in games.values():
+        for game in level_games:
+            winner, loser = game.get_winner(), game.get_loser()
+            yield get_matchup_key(winner.name, loser.name), (year, game.tourney_round, winner.name, winner.score, loser.score)
+
+
+def add_year_to_h2h_index(h2h_index: dict, year: int, games: dict) -> dict:
+    """
+    Adds one new year to a head-to-head index w/o changing it (readers may still be using it)
+    :param games: dict | { round : [Game] } for the new year
+    :return: dict | new head-to-head index, games stay in year order
+    """
+    new_index = dict(h2h_index)
+    added = dict()
+    for key, matchup in get_matchups(year, games):
+        added.setdefault(key, []).append(matchup)
+    for key, matchups in added.items():
+        new_index[key] = sorted(h2h_index.get(key, []) + matchups, key=lambda matchup: matchup[0])  # stable, keeps bracket order within a year
+    return new_index
@@ -0,0 +1,49 @@
+"""
+JSON-ready results of the team, seed, head-to-head & name completion searches
+ - shared by the JSON API (web/api.py) & the batch query CLI (query/batch.py), so both always answer w/ the same shapes
+"""
+
+from . import search, store
+from ..helpers import string_formatting as sf
+
+
+def get_team_payload(team: str) -> dict:
+    results = search.search_for_team(team, verbose=False)
+    return {
+        "team": sf.format_string_for_display(team),
+        "results": [{"round": round_number, "label": search.format_round_number(round_number, 1), "years": years}
+                    for round_number, years in sorted(results.items())],  # best -> worst finishes
+    }
+
+
+def get_seed_payload(seed: int) -> dict:
+    results = search.search_for_seed(seed, verbose=False)
+    return {
+        "seed": seed,
+        "results": [{"round": round_number, "label": search.format_round_number(round_number, 1),
+                     "teams": [{"team": team, "years": years} for team, years in years_by_team.items()]}
+                    for round_number, years_by_team in sorted(results.items())],  # best -> worst finishes
+    }
+
+
+def get_matchup_payload(team_a: str, team_b: str) -> dict:
+    games = search.search_for_matchup(team_a, team_b, verbose=False)
+    wins = [sum(1 for game in games if sf.format_string_for_comparison(game["winner"]) == sf.format_string_for_comparison(team))
+            for team in (team_a, team_b)]
+    return {
+        "teams": [{"team": sf.format_string_for_display(team), "wins": n_wins} for team, n_wins in zip((team_a, team_b), wins)],
+        "games": [{"year": game["year"], "round": game["round"], "winner": game["winner"], "score": list(game["score"])}
+                  for game in games],  # oldest -> newest
+    }
+
+
+def get_completion_payload(query: str, limit: int) -> dict:
+    """
+    :param query: str | formatted start of a team name
+    :param limit: int | max # of completions
+    """
+    completions = store.get_store().name_trie.complete(query, limit) if query else []  # no suggestions before typing
+    return {
+        "query": query,
+        "completions": [{"team": team, "appearances": appearances} for team, appearances in completions],
+    }
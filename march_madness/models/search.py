@@ -1,22 +1,76 @@
-import json
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from pprint import pprint
 from collections import OrderedDict
 
 from march_madness.models.game import *
 from march_madness.models.graph import Graph
+from . import index, store
+from ..helpers import bracket_files as bf
+from ..helpers import metrics
+from ..helpers.cache import LRUCache
 from ..helpers import string_formatting as sf
 
 
-def load_all_data() -> OrderedDict:
+def get_data_dir() -> str:
     """
-    Constructs game dictionaries for each tournament year
+    Returns the directory holding the raw bracket files (relative to the working directory)
+    :return: str | path
+    """
+    return os.path.join(os.getcwd(), "march_madness", "data")
+
+
+BRACKET_FILE = re.compile(r"bracket_(\d+)\.jl$")  # e.g. bracket_2019.jl
+
+
+def get_year_from_path(path: str) -> int:
+    """
+    :param path: bracket file, named bracket_{year}.jl
+    :return: int | tournament year, None if the file isn't named like a bracket file
+    """
+    match = BRACKET_FILE.match(os.path.basename(path))  # whole name, e.g. not old_bracket_2019.jl
+    return None if match is None else int(match.group(1))
+
+
+def get_tournament_years(data_dir: str = None) -> list[int]:
+    """
+    Finds the tournament years that have a bracket file in the data directory
+    :param data_dir: directory holding the bracket files, defaults to get_data_dir()
+    :return: sorted list of int
+    """
+    data_dir = get_data_dir() if data_dir is None else data_dir
+    years = (get_year_from_path(name) for name in os.listdir(data_dir))
+    return sorted(year for year in years if year is not None)
+
+# results of recent searches, keyed on the store version & the formatted query, cleared whenever the store is reloaded
+#  - resize w/ e.g. team_cache.configure(maxsize=1024, ttl=600)
+RESULT_CACHE_SIZE = int(os.environ.get("MARCH_MADNESS_CACHE_SIZE", 256))
+RESULT_CACHE_TTL = float(os.environ["MARCH_MADNESS_CACHE_TTL"]) if "MARCH_MADNESS_CACHE_TTL" in os.environ else None
+team_cache = LRUCache(RESULT_CACHE_SIZE, RESULT_CACHE_TTL)
+seed_cache = LRUCache(RESULT_CACHE_SIZE, RESULT_CACHE_TTL)
+
+
+def clear_result_caches():
+    team_cache.clear()
+    seed_cache.clear()
+
+
+def load_all_data(workers: int = None) -> OrderedDict:
+    """
+    Constructs game dictionaries for each tournament year w/ a bracket file in the data directory
     Format { game : { round : [Game] } }
+    :param workers: int | # of processes to parse years in parallel, None or 1 parses serially
     :return: ordered dict
     """
+    years = get_tournament_years()
+    if workers is not None and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            year_data = list(pool.map(load_data_for_year, years))
+    else:
+        year_data = map(load_data_for_year, years)
     games_by_year = OrderedDict()
-    for year in range(1939, 2020):
-        data = load_data_for_year(year)
+    for year, data in zip(years, year_data):  # merge in year order, same as the serial build
         if data is not None:
             games_by_year[year] = data
         else:
@@ -34,31 +88,25 @@ def load_data_for_year(year: int) -> OrderedDict:
     :return: dict | { round : [Game] }
     """
     # print(f"\n\n[load_data_for_year] Year {year}")
-    path = os.path.join(os.getcwd(), f"./march_madness/data/bracket_{year}.jl")
+    path = os.path.join(get_data_dir(), f"bracket_{year}.jl")
     if not os.path.exists(path):
         return None
-    with open(path) as f:
-        games = OrderedDict()
-        games_raw = json.load(f)
-        for tourney_round, game_data in games_raw.items():
-            tr = format_round_2(list(games.keys()))
-            # print(f"Round (Level): {tr}")
-            game_data_1 = [g for g in game_data if "\n\t\t\t" not in g]
-            game_data_2 = [re.sub(r"<.*?>", "", g) for g in game_data_1]
-            game_data_3 = [g.replace("\u00a0", " ") for g in game_data_2]
-            game_data_4 = [g.replace("&amp;", "&") for g in game_data_3]
-            game_data_5 = [g.split("|")[0].strip() for g in game_data_4]
-            game_data_6 = [re.sub(r"^.*?No\.", "No.", g) for g in game_data_5]
-            game_data_7 = [re.sub(r" \([\d]?OT\)$", "", g) for g in game_data_6]
-            gms = [Game(game, tourney_round) for game in game_data_7]
-            if tr in games:  # update
-                existing = games[tr]
-                for gm in gms:
-                    existing.append(gm)
-                games[tr] = existing
-            else:  # add
-                games[tr] = gms
-        return games
+    return load_bracket_file(path)
+
+
+def load_bracket_file(path: str) -> OrderedDict:
+    """
+    Builds the Game objects for one bracket file, structured or legacy (see helpers/bracket_files.py)
+    :param path: bracket_{year}.jl file
+    :return: dict | { round : [Game] }
+    """
+    games = OrderedDict()
+    for tourney_round, teams_by_game in bf.read_bracket_file(path).items():
+        tr = format_round_2(list(games.keys()))
+        # print(f"Round (Level): {tr}")
+        games[tr] = [Game.from_parts([Team.from_parts(name, seed, score) for seed, name, score in teams], format_round(tourney_round))
+                     for teams in teams_by_game]
+    return games
 
 
 def generate_graph_for_year(games: dict, year: int) -> Graph:
@@ -70,204 +118,270 @@ def generate_graph_for_year(games: dict, year: int) -> Graph:
     """
 
     # print(f"\n\n[generate_graph_for_year] Year {year}")
-    final_game = trawl_graph(-1, OrderedDict(), games[year])
-    return Graph(year, final_game)
+    first_games = dict()
+    with metrics.stage("link"):
+        final_game = trawl_graph(games[year], year, first_games)
+    return Graph(year, final_game, first_games)
 
 
-def is_node_leaf(level: int, node: Game, nodes_below_level: OrderedDict) -> bool:
+class ChampionshipNotFoundError(ValueError):
     """
-    Checks if the node is a leaf
-     - Answers the question: "Did one of the teams playing in the current game have to win a game at an earlier level?" If not, it is a leaf.
-    :param level: int | level in graph of node
-    :param node: Game
-    :param nodes_below_level: dict of all games at LOWER levels than "level"
-    :return: true if leaf, false if not
+    Raised when none of the championship heuristics match the games of a year
     """
 
-    # print(f"\n[leaf_node_check] Level {level} | Game: {node.get_game_summary()}")
-    t1 = node.team1.name
-    t2 = node.team2.name
-    if level == 0:  # lowest level guaranteed to be leaves
-        # print("**leaf**")
-        return True
-    else:
-        winners = set()
-        for i in range(0, level):  # get ALL winners at any level below this one
-            nds = nodes_below_level[i]
-            for nd in nds:
-                winners.add(nd.get_winner().name)
-        if (t1 not in winners) and (t2 not in winners):
-            # print("**leaf**")
-            return True
-        # print("--node--")
-    return False
-
-
-def get_child_nodes(node: Game, nodes_below: OrderedDict) -> set[Game]:
-    """
-    For a given non-leaf node, finds the child nodes in the below levels
-     - Note: a child node determines one of the teams playing the current Game
-     - Note: children are not guaranteed to be exactly 1 level down, but they must be at a lower level
-    :param node: game for which we want to find children
-    :param nodes_below: games that happened earlier in tournament
-    :return: set of child nodes (Game objects)
-    """
-
-    # print("  looking for children...")
-    children = set()
-    t1 = node.team1.name
-    t2 = node.team2.name
-    keys = list(nodes_below.keys())
-    level_below = keys[-1]  # start with last key in list
-    for game in nodes_below[level_below]:
-        # print(f"  game:  {game.get_game_summary()}")
-        if t1 == game.get_winner().name or t2 == game.get_winner().name:
-            # print(f"\tfound child:    {game.get_game_summary()}")
-            children.add(game)
-
-    if len(children) == 0:  # some games have only 1 child (1 team played qualifier)
-        # print(f"Didn't find children, step down a level...")
-        if len(keys) > 1:  # more than 1 key remaining
-            cp = nodes_below.copy()
-            del(cp[level_below])
-            return get_child_nodes(node, cp)
-        else:
-            # print("Error: no levels remaining!")
-            pass
-    return children
+    def __init__(self, games_per_level: dict, year: int = None):
+        self.games_per_level = games_per_level  # { level : # games }
+        self.year = year
+        super().__init__(f"No championship found for year {year} | games per level: {games_per_level}")
 
+    def __reduce__(self):
+        return type(self), (self.games_per_level, self.year)  # rebuilt w/ the same fields when raised in a worker process
 
-def trawl_graph(level: int, nodes: OrderedDict, remaining_nodes: OrderedDict) -> Game:
+
+def record_winners(level: int, games: list[Game], wins_by_team: dict):
     """
-    Starts from leaves & trawls up graph recursively till championship
-    :param level: int | current level of recursion, 0 -> leaf
-    :param nodes: ordered dict | games in order of round, w/ children set
-    :param remaining_nodes: ordered dict | games w/o children set yet
-    :return: Game | returns single game, with children assigned appropriately
+    Adds the winners of a level to the index of games won by each team
+     - levels must be recorded in order (lowest first), so the end of each list holds the team's latest wins
+    :param level: int | level in graph of the games
+    :param games: games played on the level
+    :param wins_by_team: dict | { team name : [(level, Game)] }
     """
+    for game in games:
+        wins_by_team.setdefault(game.get_winner().name, []).append((level, game))
 
-    current = [node for node_ls in nodes.values() for node in node_ls]
-    remaining = [node for node_ls in remaining_nodes.values() for node in node_ls]
-    # print(f"\n[trawl_graph] Level {level} | # Current Nodes: {len(current)} | # Nodes Remaining: {len(remaining)}")
-    remaining_levels = list(remaining_nodes.keys())
-    # print(f"{remaining_levels} remaining levels to trawl...")
-    while len(remaining_levels) > 0:  # there remain levels to be trawled
-        next_level = remaining_levels[0]
-        formatted_nodes = list()
-        for node in remaining_nodes[next_level]:
-            if not is_node_leaf(next_level, node, nodes):
-                # if node is not a leaf, add children to current node before recursion
-                node.children = get_child_nodes(node, nodes)
-            formatted_nodes.append(node)
-        nodes[next_level] = formatted_nodes  # assign formatted nodes to dict
-        del (remaining_nodes[next_level])  # remove nodes from remaining
-        return trawl_graph(next_level, nodes, remaining_nodes)
 
-    return get_championship(nodes)  # stopping condition - return top-level game
+def record_first_games(games: list[Game], first_games: dict):
+    """
+    Adds the teams playing their first game of the year on a level to the index of first games
+     - levels must be recorded in order (lowest first)
+    :param games: games played on the level
+    :param first_games: dict | { formatted team name : Game }
+    """
+    for game in games:
+        for team in game.teams:
+            first_games.setdefault(sf.format_string_for_comparison(team.name), game)
 
 
-def all_games_in_tournament(games: OrderedDict) -> list[Game]:
+def set_parent(node: Game):
     """
-    Generates flat list of all games
-    :param games: all games
-    :return:
+    Points the children of a game back at it, unless a game earlier in the bracket already claimed them
+     - a game can be listed as a child more than once (e.g. by the semifinal & the third-place game), the first
+       claim is the game its winner played next
+    :param node: game w/ children set
     """
-    flat_games = []
-    for key, val in games.items():
-        for game in val:
-            flat_games.append(game)
-    return flat_games
+    for child in node.children:
+        if child.parent is None and child is not node:
+            child.parent = node
 
 
-def get_championship(nodes: OrderedDict) -> Game:
+def find_child_nodes(node: Game, wins_by_team: dict, skip_levels: tuple = (), skip_games: tuple = ()) -> tuple[Game]:
+    """
+    Finds the child nodes of a game from the index of games won by each team
+     - children are the games won by either team at the highest indexed level where one of them won
+     - a node w/o children is a leaf: neither team had to win a game at an earlier level to get into it
+     - Note: a team's list only holds the few games it won that year, so this is constant time per game
+    :param node: game for which we want to find children
+    :param wins_by_team: dict | { team name : [(level, Game)] } for the levels the children can come from
+    :param skip_levels: levels to ignore in the index
+    :param skip_games: games to ignore in the index
+    :return: tuple of child nodes (Game objects), in the order they were won
+    """
+    wins = [(level, game) for team in (node.team1.name, node.team2.name) for level, game in wins_by_team.get(team, [])
+            if level not in skip_levels and game not in skip_games]
+    if len(wins) == 0:
+        return ()
+    level_below = max(level for level, _ in wins)
+    return tuple(dict.fromkeys(game for level, game in wins if level == level_below))  # drop duplicates, keep order
+
+
+def find_repeated_winner(games: list[Game]):
+    """
+    Finds the first game on a level won by a team that already won on that level (-> championship candidate)
+     - a leaf this high up must be a 3rd place game, so the search stops there
+    :param games: games on a single level, w/ children set
+    :return: Game | None if no winner repeats
+    """
+    winners = set()
+    for game in games:
+        if game.is_leaf():
+            return None
+        winner = game.get_winner().name
+        if winner in winners:
+            return game
+        winners.add(winner)
+    return None
+
+
+def trawl_graph(games: OrderedDict, year: int = None, first_games: dict = None) -> Game:
+    """
+    Starts from leaves & trawls up graph level by level till championship
+     - keeps an index of the games won by each team, so linking each game is constant time
+     - gathers the facts get_championship needs along the way
+     - sets each game's parent when it is first linked as a child
+    :param games: ordered dict | { level : [Game] } for a single year, 0 -> leaf
+    :param year: int | tournament year, used for error reporting
+    :param first_games: dict | filled w/ { formatted team name : first Game the team played } if given
+    :return: Game | returns single game, with children assigned appropriately
     """
-    Sets children & returns championship Game object
+
+    nodes = OrderedDict()  # games in order of round, w/ children set
+    wins_by_team = dict()
+    levels = list(games.keys())
+    final_game = None  # first game marked w/ "2" round
+    final_children = ()
+    repeated_winners = dict()  # { level : first game won by a repeated winner }
+    for level, level_games in games.items():
+        for node in level_games:
+            node.parent = None  # children always come from earlier levels, so nothing has claimed this game yet
+            node.children = find_child_nodes(node, wins_by_team)
+            set_parent(node)
+            if final_game is None and node.tourney_round == "2":
+                final_game = node
+        if final_game is not None and level == levels[-1]:
+            # children of the marked game come from every level but the last one
+            final_children = find_child_nodes(final_game, wins_by_team)
+        repeated_winners[level] = find_repeated_winner(level_games)
+        record_winners(level, level_games, wins_by_team)
+        if first_games is not None:
+            record_first_games(level_games, first_games)
+        nodes[level] = level_games
+
+    return get_championship(nodes, wins_by_team, final_game, final_children, repeated_winners, year)
+
+
+def get_championship(nodes: OrderedDict, wins_by_team: dict, final_game: Game, final_children: tuple,
+                     repeated_winners: dict, year: int = None) -> Game:
+    """
+    Sets children & returns championship Game object, using the facts gathered while linking
      - Note: NOT guaranteed that championship is final game or only game on level
+     - in order: game marked w/ "2" round -> lone non-leaf game on a level -> 2nd game won by the same team on a level
     :param nodes: full dict of all games in order, w/ children set
+    :param wins_by_team: dict | { team name : [(level, Game)] } for all levels
+    :param final_game: first game marked w/ "2" round, None if no game is marked
+    :param final_children: children of final_game, from every level but the last one
+    :param repeated_winners: dict | { level : first game won by a repeated winner, None if no winner repeats }
+    :param year: int | tournament year, used for error reporting
     :return: championship Game object
     """
 
-    # print("\n[get_championship]")
-    for lvl in list(nodes.keys())[::-1]:  # traverse node dict in reverse order
-        # print(f"Level {lvl}")
-
-        for gm in all_games_in_tournament(nodes):
-            if gm.tourney_round == "2":
-                # check if any game is marked w/ "2" round -> championship
-                node_cp = nodes.copy()
-                del (node_cp[lvl])
-                gm.children = get_child_nodes(gm, node_cp)
-                gm.is_championship = True
-                # print(f"!!! CHAMPION - {gm.get_game_summary()} !!!   *by round num*")
-                return gm
+    if final_game is not None:
+        # check if any game is marked w/ "2" round -> championship
+        final_game.children = final_children
+        set_parent(final_game)
+        final_game.is_championship = True
+        return final_game
 
+    removed = set()  # lone leaf games are dropped from the search once checked
+    for lvl in list(nodes.keys())[::-1]:  # traverse levels in reverse order
         if len(nodes[lvl]) == 1:
-            gm = nodes[lvl].pop()
+            gm = nodes[lvl][0]
+            removed.add(gm)
             if not gm.is_leaf():
                 # only 1 NON-leaf game in round -> championship
-                node_cp = nodes.copy()
-                del(node_cp[lvl])
-                gm.children = get_child_nodes(gm, node_cp)
+                gm.children = find_child_nodes(gm, wins_by_team, skip_levels=(lvl,), skip_games=removed)
+                set_parent(gm)
                 gm.is_championship = True
-                # print(f"!!! CHAMPION - {gm.get_game_summary()} !!!   *lone leaf*")
                 return gm
+            continue
+
+        node = repeated_winners[lvl]
+        if node is not None:  # 2nd occurrence of winner -> championship
+            # semifinals are the other games on this level won by either team
+            node.children = find_child_nodes(node, wins_by_team, skip_games=removed | {node})
+            set_parent(node)
+            node.is_championship = True
+            return node
+
+    raise ChampionshipNotFoundError({lvl: len(level_games) for lvl, level_games in nodes.items()}, year)
+
+
+def link_year(year: int, games: OrderedDict) -> tuple:
+    """
+    Links a single year's games into a Graph (runs in a worker process for parallel builds)
+    :param year: int | tournament year
+    :param games: dict | { round : [Game] } for the year
+    :return: tuple(games, Graph) | returned together so the Graph shares the returned Game objects
+    """
+    return games, generate_graph_for_year({year: games}, year)
 
-        winners = list()
-        for node in nodes[lvl]:
-            if node.is_leaf():  # leaf this high up must be 3rd place game
-                # print(" third place game")
-                break
-            winner = node.get_winner().name
-            if winner not in winners:
-                winners.append(winner)
-            else:  # 2nd occurrence of winner -> championship
-                nodes_cp = nodes[lvl].copy()
-                nodes_cp.remove(node)  # remove this node from node list
-                dict_cp = nodes.copy()  # copy full node dict
-                dict_cp[lvl] = nodes_cp  # replace level w/ modified node ls
-                node.children = get_child_nodes(node, dict_cp)
-                node.is_championship = True
-                # print(f"!!! CHAMPION - {node.get_game_summary()} !!!   *twice winner*")
-                return node  # championship game is one where winner is not in list of losers
-    print("ERROR - no champ found :(")
-
-
-def construct_graphs(games_by_year: OrderedDict) -> dict:
+
+def construct_graphs(games_by_year: OrderedDict, workers: int = None) -> dict:
     """
     Starting from the dict containing { round : games }, constructs Graph of tournament structure for the year
      - each node is a Game (top node is championship)
      - each child of a node is the previous Game played by the teams in the current Game
      - leaf: a game where the two teams in it did NOT win to get into that game
     :param games_by_year: dict w/ all games indexed by year
+    :param workers: int | # of processes to link years in parallel, None or 1 links serially
+     - in parallel, each year's games come back as linked copies & replace the entries in games_by_year
+     - a year w/o a championship (e.g. a tournament still in progress) is logged & removed from games_by_year
     :return: dict | key = year, value = Graph
     """
 
     graph = dict()
-    for year in games_by_year.keys():
-        graph[year] = generate_graph_for_year(games_by_year, year)
+    if workers is not None and workers > 1:
+        years = list(games_by_year.keys())
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(link_year, year, games_by_year[year]) for year in years]
+            for year, future in zip(years, futures):
+                try:
+                    games_by_year[year], graph[year] = future.result()
+                except ChampionshipNotFoundError as e:
+                    skip_year(games_by_year, year, e)
+        return graph
+    for year in list(games_by_year.keys()):
+        try:
+            graph[year] = generate_graph_for_year(games_by_year, year)
+        except ChampionshipNotFoundError as e:
+            skip_year(games_by_year, year, e)
     return graph
 
 
-def search_for_team(team: str) -> dict:
+def skip_year(games_by_year: OrderedDict, year: int, error: ChampionshipNotFoundError):
+    """
+    Drops a year that couldn't be linked, so the other years still load
+    """
+    print(f"[construct_graphs] Skipping {year}: {error}")
+    del games_by_year[year]
+
+
+def search_for_team(team: str, verbose: bool = True) -> dict:
     """
     Searches through full graph for best results by given TEAM
     :param team: str | name
+    :param verbose: print progress & results to stdout
     :return: dict(best_result_by_round: [year])
     """
 
-    print(f"\n\n[search] Searching graph for team '{team}'...")
-    full_graph = construct_graphs(load_all_data())
-    results = dict()
-    for year in full_graph.keys():
-        _, result_tuple = full_graph[year].bfs(year, team=team)
-        result, team_name = result_tuple
-        if result in results.keys():  # result was achieved in previous year
-            existing_years = results[result]
-            existing_years.append(year)  # add to END of list to preserve order
-            results[result] = existing_years
-        else:  # new result type
-            results[result] = [year]
+    if verbose:
+        print(f"\n\n[search] Searching graph for team '{team}'...")
+    query = sf.format_string_for_comparison(team)
+    tournament = store.get_store()
+    key = (tournament.version, query)  # never hit once the store is swapped, even if put after the caches were cleared
+    cached = team_cache.get(key)
+    if cached is not None:
+        results = {result: list(years) for result, years in cached.items()}  # copy, callers may modify results
+    else:
+        with metrics.stage("search"):
+            best_round_by_year = tournament.team_index.get(query, dict())
+            results = dict()
+            for year in tournament.years():
+                result = best_round_by_year.get(year, Team.RESULT_NO_WINS)
+                if result in results.keys():  # result was achieved in previous year
+                    results[result].append(year)  # add to END of list to preserve order
+                else:  # new result type
+                    results[result] = [year]
+        team_cache.put(key, {result: list(years) for result, years in results.items()})
+
+    if verbose:  # same output whether or not the results were cached
+        print_team_results(team, results)
+    return results
 
+
+def print_team_results(team: str, results: dict):
+    """
+    :param results: dict(best_result_by_round: [year]) | as returned by search_for_team
+    """
     print("\n")
     sorted_keys = sorted(results.keys())  # sort low -> high (best -> worst finishes)
     counter = 0
@@ -281,34 +395,88 @@ def search_for_team(team: str) -> dict:
             else:
                 print(f"Other results: win in <{formatted_round}> in {', '.join(y)}")
         counter += 1
-    return results
 
 
-def search_for_seed(seed: int) -> dict:
+def search_for_team_runs(team: str, verbose: bool = True) -> OrderedDict:
+    """
+    Collects a team's run (first game -> elimination) in every year it played
+    :param team: str | name
+    :param verbose: print progress & results to stdout
+    :return: ordered dict | { year : [Game] } oldest -> newest, years the team didn't play are left out
+    """
+
+    if verbose:
+        print(f"\n\n[search] Collecting tournament runs for team '{team}'...")
+    runs = OrderedDict()
+    with metrics.stage("search"):
+        for year, graph in store.get_store().graphs.items():
+            run = graph.team_run(team)
+            if len(run) > 0:
+                runs[year] = run
+    if verbose:
+        print(f"'{sf.format_string_for_display(team)}' played in {len(runs)} tournaments")
+    return runs
+
+
+def suggest_teams(team: str, limit: int = 5) -> list[tuple]:
+    """
+    Finds the teams a misspelled search most likely meant (e.g. "Conneticut" -> "Connecticut")
+    :param team: str | name as typed
+    :param limit: int | max # of suggestions
+    :return: list of tuple(team_name: str, score: float) | best -> worst, score 1.0 == same name ignoring punctuation
+    """
+    return store.get_store().name_index.search(team, limit)
+
+
+AUTO_RESOLVE_SCORE = 0.5  # min similarity for a misspelled search to be treated as the suggested team
+AUTO_RESOLVE_MARGIN = 0.15  # ...as long as no other suggestion comes this close
+
+
+def resolve_team(team: str) -> tuple:
+    """
+    Matches a searched name to a team in the data, correcting misspellings when there is a clear match
+    :param team: str | name as typed
+    :return: tuple(team_name: str, suggestions: [str]) | team_name is the input if it matches a team exactly,
+        the corrected name if one suggestion clearly wins & None otherwise, suggestions are empty on a match
+    """
+    if team in store.get_store().name_index:
+        return team, []
+    candidates = suggest_teams(team)
+    if len(candidates) > 0 and candidates[0][1] >= AUTO_RESOLVE_SCORE:
+        if len(candidates) == 1 or candidates[0][1] - candidates[1][1] >= AUTO_RESOLVE_MARGIN:
+            return candidates[0][0], []
+    return None, [name for name, _ in candidates]
+
+
+def search_for_seed(seed: int, verbose: bool = True) -> dict:
     """
     Searches through full graph for best results by given SEED
     :param seed: int | number of desired seed to search
+    :param verbose: print progress & results to stdout
     :return: dict(best_result_by_round: team: [year])  -differs from "team search" result
     """
 
-    print(f"\n\n[search] Searching graph for seed #{seed}...")
-    full_graph = construct_graphs(load_all_data())
-    results = dict()
-    for year in full_graph.keys():
-        _, result_tuple = full_graph[year].bfs(year, seed=seed)
-        result, team_name = result_tuple
-        if result in results.keys():  # result was achieved in previous year
-            years_by_team = results[result]  # dict(team: year)
-            if team_name in years_by_team:  # team already exists
-                results_for_team = years_by_team[team_name]
-                results_for_team.append(year)
-                years_by_team[team_name] = results_for_team  # add year to list
-            else:  # new team
-                years_by_team[team_name] = [year]  # create list
-            results[result] = years_by_team
-        else:  # new result type
-            results[result] = {team_name: [year]}
+    if verbose:
+        print(f"\n\n[search] Searching graph for seed #{seed}...")
+    tournament = store.get_store()
+    key = (tournament.version, seed)  # see search_for_team
+    cached = seed_cache.get(key)
+    if cached is not None:
+        results = copy_seed_results(cached)
+    else:
+        with metrics.stage("search"):
+            results = get_seed_results(tournament, seed)
+        seed_cache.put(key, copy_seed_results(results))
+
+    if verbose:  # same output whether or not the results were cached
+        print_seed_results(seed, results)
+    return results
 
+
+def print_seed_results(seed: int, results: dict):
+    """
+    :param results: dict(best_result_by_round: team: [year]) | as returned by search_for_seed
+    """
     print(f"\nBest results for a #{seed} Seed:")
     sorted_keys = sorted(results.keys())  # sort low -> high (best -> worst finishes)
     if len(sorted_keys) == 1:
@@ -322,9 +490,69 @@ def search_for_seed(seed: int) -> dict:
                 for team, years in years_by_team.items():
                     y = [f"{yr}" for yr in years]
                     print(f"    Team '{sf.format_string_for_display(team)}' in {', '.join(y)}")
+
+
+def search_for_seeds(seeds: list[int] = None, verbose: bool = True) -> dict:
+    """
+    Batch version of search_for_seed, returns the best results for many seeds at once
+     - every seed comes from the seed index, which is built in a single pass over each year's graph
+    :param seeds: list of seeds to search, defaults to all 16 seeds
+    :param verbose: print progress to stdout
+    :return: dict | { seed : dict(best_result_by_round: team: [year]) }
+    """
+
+    seeds = range(1, 17) if seeds is None else seeds
+    if verbose:
+        print(f"\n\n[search] Searching graph for seeds {', '.join(str(s) for s in seeds)}...")
+    tournament = store.get_store()
+    return {seed: get_seed_results(tournament, seed) for seed in seeds}
+
+
+def search_for_matchup(team_1: str, team_2: str, verbose: bool = True) -> list[dict]:
+    """
+    Looks up every tournament game between two teams in the store's head-to-head index
+    :param team_1: str | name
+    :param team_2: str | name, order of the two teams doesn't matter
+    :param verbose: print progress & results to stdout
+    :return: list of dict(year, round, winner, score) | oldest -> newest, score is (winner's, loser's), empty if they never met
+    """
+
+    if verbose:
+        print(f"\n\n[search] Searching head-to-head games for '{team_1}' vs. '{team_2}'...")
+    with metrics.stage("search"):
+        matchups = store.get_store().h2h_index.get(index.get_matchup_key(team_1, team_2), [])
+        results = [{"year": year, "round": tourney_round, "winner": winner, "score": (winner_score, loser_score)}
+                   for year, tourney_round, winner, winner_score, loser_score in matchups]
+
+    if verbose:
+        if len(results) == 0:
+            print(f"'{sf.format_string_for_display(team_1)}' & '{sf.format_string_for_display(team_2)}' never met in March Madness")
+        for result in results:
+            print(f"  {result['year']} (round '{result['round']}'): {result['winner']} won {result['score'][0]} - {result['score'][1]}")
     return results
 
 
+def get_seed_results(tournament, seed: int) -> dict:
+    """
+    Looks up the results for a seed in the store's seed index
+    :param tournament: TournamentStore
+    :param seed: int | number of desired seed
+    :return: dict(best_result_by_round: team: [year]) | a copy, so callers can't modify the shared index
+    """
+    if seed not in tournament.seed_index:  # seed never appears in any bracket
+        return {Team.RESULT_NO_WINS: {"": tournament.years()}}
+    return copy_seed_results(tournament.seed_index[seed])
+
+
+def copy_seed_results(results: dict) -> dict:
+    """
+    :param results: dict(best_result_by_round: team: [year])
+    :return: dict | copy of results w/ new year lists
+    """
+    return {result: {team_name: list(years) for team_name, years in years_by_team.items()}
+            for result, years_by_team in results.items()}
+
+
 def format_round_number(r: int, n_keys: int) -> str:
     """
     Returns formatted string based on input 'best round' result
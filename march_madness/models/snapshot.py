@@ -0,0 +1,247 @@
+"""
+Compact binary snapshot of the parsed & linked brackets for every year
+ - lets a cold start skip json loading, HTML cleanup, team parsing & graph linking
+ - stamped w/ a format version & a hash of the raw bracket files, so it is rebuilt whenever either changes
+
+Layout (little-endian):
+ header  | magic, version, data hash, # strings, # years
+ strings | length-prefixed utf-8 (team names & rounds)
+ years   | year, # levels, # games, championship index
+           then per level: level key, # games
+           then per game:  round string, championship flag, # teams, # children, parent index, teams (seed, name, score), child indices
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+from collections import OrderedDict
+
+from . import search
+from ..helpers import bracket_files as bf
+from .game import Game, Team
+from .graph import Graph
+
+SNAPSHOT_VERSION = 3
+SNAPSHOT_FILENAME = "brackets.snapshot"
+MAGIC = b"MMSNAP"
+
+HEADER = struct.Struct("<6sH32sII")  # magic, version, data hash, # strings, # years
+STRING_LENGTH = struct.Struct("<H")
+YEAR = struct.Struct("<HHIi")  # year, # levels, # games, championship index
+LEVEL = struct.Struct("<HI")  # level key, # games on level
+GAME = struct.Struct("<IBBBi")  # round string, is championship, # teams, # children, parent index (-1: none)
+TEAM = struct.Struct("<hIH")  # seed, name string, score
+CHILD = struct.Struct("<I")  # index of child game within the year
+
+
+def get_snapshot_path() -> str:
+    return os.path.join(search.get_data_dir(), SNAPSHOT_FILENAME)
+
+
+def hash_bracket_file(name: str, content: bytes) -> bytes:
+    """
+    :param name: file name, e.g. bracket_2019.jl
+    :param content: raw file contents
+    :return: bytes | sha256 digest of the name & contents
+    """
+    digest = hashlib.sha256()
+    digest.update(name.encode("utf-8"))
+    digest.update(struct.pack("<Q", len(content)))
+    digest.update(content)
+    return digest.digest()
+
+
+def compute_file_digests(data_dir: str = None) -> OrderedDict:
+    """
+    Hashes every raw bracket file that load_all_data loads (see search.get_tournament_years), so stray files never force a rebuild
+    :param data_dir: directory holding the bracket files
+    :return: ordered dict | { year : sha256 digest of bracket_{year}.jl }, oldest -> newest
+    """
+    data_dir = search.get_data_dir() if data_dir is None else data_dir
+    file_digests = OrderedDict()
+    for year in search.get_tournament_years(data_dir):
+        name = f"bracket_{year}.jl"
+        with open(os.path.join(data_dir, name), "rb") as f:
+            file_digests[year] = hash_bracket_file(name, f.read())
+    return file_digests
+
+
+def combine_digests(file_digests: dict) -> bytes:
+    """
+    :param file_digests: dict | { year : file digest } as returned by compute_file_digests
+    :return: bytes | sha256 digest of the whole data directory, adding a year only needs that year's file hashed
+    """
+    digest = hashlib.sha256()
+    for year in sorted(file_digests.keys()):
+        digest.update(file_digests[year])
+    return digest.digest()
+
+
+def compute_data_hash(data_dir: str = None) -> bytes:
+    """
+    Hashes the names & contents of every raw bracket file
+    :param data_dir: directory holding the bracket files
+    :return: bytes | sha256 digest
+    """
+    return combine_digests(compute_file_digests(data_dir))
+
+
+def write_snapshot(path: str, data_hash: bytes, games_by_year: OrderedDict, graphs: dict):
+    """
+    Writes all games & their links to a binary snapshot (atomically, see bracket_files.write_atomic)
+    :param path: destination file
+    :param data_hash: hash of the raw bracket files the games were parsed from
+    :param games_by_year: dict | { year : { round : [Game] } }
+    :param graphs: dict | key = year, value = Graph
+    """
+
+    strings = dict()  # string -> index in string table
+
+    def string_id(text: str) -> int:
+        if text not in strings:
+            strings[text] = len(strings)
+        return strings[text]
+
+    year_chunks = []
+    for year, games in games_by_year.items():
+        flat_games = [game for level_games in games.values() for game in level_games]
+        game_ids = {game: i for i, game in enumerate(flat_games)}
+        championship = graphs[year].championship
+        chunk = [YEAR.pack(year, len(games), len(flat_games), game_ids.get(championship, -1))]
+        for level, level_games in games.items():
+            chunk.append(LEVEL.pack(level, len(level_games)))
+        for game in flat_games:
+            parent_id = game_ids[game.parent] if game.parent is not None else -1
+            chunk.append(GAME.pack(string_id(game.tourney_round), game.is_championship, len(game.teams), len(game.children), parent_id))
+            for team in game.teams:
+                chunk.append(TEAM.pack(team.seed, string_id(team.name), team.score))
+            for child in game.children:
+                chunk.append(CHILD.pack(game_ids[child]))
+        year_chunks.append(b"".join(chunk))
+
+    string_chunks = []
+    for text in strings:  # dicts preserve insertion order == string index
+        encoded = text.encode("utf-8")
+        string_chunks.append(STRING_LENGTH.pack(len(encoded)) + encoded)
+
+    header = HEADER.pack(MAGIC, SNAPSHOT_VERSION, data_hash, len(strings), len(year_chunks))
+    bf.write_atomic(path, b"".join([header, *string_chunks, *year_chunks]))
+
+
+def read_snapshot(path: str, data_hash: bytes = None) -> tuple:
+    """
+    Memory-maps a snapshot & rebuilds the linked games without any parsing or linking
+    :param path: snapshot file
+    :param data_hash: expected hash of the raw bracket files, None to skip the check
+    :return: tuple(games_by_year, graphs) | None if the snapshot is missing, stale or corrupt
+    """
+
+    if not os.path.exists(path) or os.path.getsize(path) < HEADER.size:
+        return None
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        magic, version, stored_hash, n_strings, n_years = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC or version != SNAPSHOT_VERSION:
+            return None
+        if data_hash is not None and stored_hash != data_hash:
+            return None
+        try:
+            return read_snapshot_body(buf, n_strings, n_years)
+        except (struct.error, IndexError, UnicodeDecodeError, ValueError):  # truncated or corrupt body
+            return None
+
+
+def read_snapshot_body(buf, n_strings: int, n_years: int) -> tuple:
+    """
+    :param buf: snapshot contents, header included
+    :param n_strings: # of strings in the table, from the header
+    :param n_years: # of years, from the header
+    :return: tuple(games_by_year, graphs)
+     - raises struct.error, IndexError, UnicodeDecodeError or ValueError if the body is truncated or corrupt
+    """
+    offset = HEADER.size
+
+    strings = []
+    for _ in range(n_strings):
+        (length,) = STRING_LENGTH.unpack_from(buf, offset)
+        offset += STRING_LENGTH.size
+        strings.append(buf[offset:offset + length].decode("utf-8"))
+        offset += length
+
+    games_by_year = OrderedDict()
+    graphs = dict()
+    for _ in range(n_years):
+        year, n_levels, n_games, championship_id = YEAR.unpack_from(buf, offset)
+        offset += YEAR.size
+        levels = []
+        for _ in range(n_levels):
+            levels.append(LEVEL.unpack_from(buf, offset))
+            offset += LEVEL.size
+
+        flat_games = []
+        child_ids = []
+        parent_ids = []
+        for _ in range(n_games):
+            round_id, is_championship, n_teams, n_children, parent_id = GAME.unpack_from(buf, offset)
+            offset += GAME.size
+            teams = []
+            for _ in range(n_teams):
+                seed, name_id, score = TEAM.unpack_from(buf, offset)
+                offset += TEAM.size
+                teams.append(Team.from_parts(strings[name_id], seed, score))
+            flat_games.append(Game.from_parts(teams, strings[round_id], bool(is_championship)))
+            parent_ids.append(parent_id)
+            child_ids.append([CHILD.unpack_from(buf, offset + i * CHILD.size)[0] for i in range(n_children)])
+            offset += n_children * CHILD.size
+
+        for game, ids, parent_id in zip(flat_games, child_ids, parent_ids):
+            game.children = tuple(flat_games[i] for i in ids)
+            game.parent = flat_games[parent_id] if parent_id != -1 else None
+
+        games = OrderedDict()
+        first_games = dict()
+        start = 0
+        for level, count in levels:
+            games[level] = flat_games[start:start + count]
+            search.record_first_games(games[level], first_games)
+            start += count
+        games_by_year[year] = games
+        championship = flat_games[championship_id] if championship_id != -1 else None
+        graphs[year] = Graph(year, championship, first_games)
+    if offset != len(buf):
+        raise ValueError(f"Snapshot has {len(buf) - offset} unexpected trailing bytes")
+    return games_by_year, graphs
+
+
+def load_or_build(path: str = None, workers: int = None, data_hash: bytes = None) -> tuple:
+    """
+    Loads the games & graphs from the snapshot, rebuilding it from the raw bracket files if it is missing, stale or corrupt
+    :param path: snapshot file, defaults to the data directory
+    :param workers: int | # of processes used if the snapshot has to be rebuilt
+    :param data_hash: hash of the raw bracket files if already computed
+    :return: tuple(games_by_year, graphs)
+    """
+
+    path = get_snapshot_path() if path is None else path
+    data_hash = compute_data_hash() if data_hash is None else data_hash
+    loaded = read_snapshot(path, data_hash)
+    if loaded is not None:
+        return loaded
+    print(f"[snapshot] Rebuilding {path}")
+    games_by_year = search.load_all_data(workers)
+    graphs = search.construct_graphs(games_by_year, workers)
+    save_snapshot(path, data_hash, games_by_year, graphs)
+    return games_by_year, graphs
+
+
+def save_snapshot(path: str, data_hash: bytes, games_by_year: OrderedDict, graphs: dict) -> bool:
+    """
+    Writes the snapshot if possible, it is only a cache, so e.g. a read-only data directory just means rebuilding on every start
+    :return: bool | True if the snapshot was written
+    """
+    try:
+        write_snapshot(path, data_hash, games_by_year, graphs)
+    except OSError as e:
+        print(f"[snapshot] Couldn't write {path}, continuing w/o a snapshot: {e}")
+        return False
+    return True
@@ -0,0 +1,179 @@
+import copy
+import os
+import threading
+from collections import OrderedDict
+
+from . import index, search, snapshot
+from ..helpers import bracket_files as bf
+
+
+class TournamentStore(object):
+
+    """
+    Process-level container for every tournament year
+     - holds the parsed games { year : { round : [Game] } } and the linked Graph for each year
+     - built once per process & shared by all search functions, so requests never re-parse the bracket data
+     - team_index maps a formatted team name to its best round in each year it won a game
+     - seed_index maps a seed to the teams & years behind each of its best results (same shape as search_for_seed)
+     - name_index is a trigram index of every team name, for suggesting teams when a search has no exact match
+     - name_trie completes the start of a team name, ranked by # of tournament appearances
+     - h2h_index maps a pair of formatted team names to every game between them (see search_for_matchup)
+     - table is a columnar NumPy view of every game, built on first use
+     - version identifies the bracket data the store was built from (hash of the raw files)
+     - file_digests holds the hash of each year's raw file, so adding a year only hashes the new file
+     - a store is never changed once built, new years are added to a copy (see ingest_year)
+    """
+
+    def __init__(self, games_by_year: OrderedDict, graphs: dict, version: str = "", file_digests: dict = None):
+        self.games_by_year = games_by_year
+        self.graphs = graphs
+        self.version = version
+        self.file_digests = dict() if file_digests is None else file_digests
+        self.team_index = index.build_team_index(graphs)
+        self.seed_index = index.build_seed_index(graphs)
+        self.name_index = index.build_name_index(games_by_year)
+        self.name_trie = index.build_name_trie(games_by_year)
+        self.h2h_index = index.build_h2h_index(games_by_year)
+        self._table = None
+
+    def get_table(self):
+        if self._table is None:
+            from .table import GameTable  # numpy is only needed for columnar queries
+            self._table = GameTable(self.games_by_year)
+        return self._table
+
+    table = property(get_table)
+
+    @classmethod
+    def build(cls, use_snapshot: bool = True, workers: int = None):
+        """
+        Loads the bracket data & links the graphs for all years
+        :param use_snapshot: load from the binary snapshot (rebuilt if stale) instead of parsing the raw files
+        :param workers: int | # of processes used when parsing & linking the raw files, None or 1 is serial
+        :return: TournamentStore
+        """
+        file_digests = snapshot.compute_file_digests()
+        data_hash = snapshot.combine_digests(file_digests)
+        if use_snapshot:
+            games_by_year, graphs = snapshot.load_or_build(workers=workers, data_hash=data_hash)
+        else:
+            games_by_year = search.load_all_data(workers)
+            graphs = search.construct_graphs(games_by_year, workers)
+        return cls(games_by_year, graphs, data_hash.hex(), file_digests)
+
+    def years(self) -> list[int]:
+        return list(self.graphs.keys())
+
+    def with_year(self, year: int, games: OrderedDict, graph, version: str, file_digest: bytes = None):
+        """
+        Returns a copy of the store w/ one more (linked) year, this store is left untouched for readers still using it
+         - the lookups are updated from the new year alone, unchanged parts are shared w/ this store
+         - the columnar table is rebuilt on first use
+        :param year: int | tournament year, must not be in the store yet
+        :param games: dict | { round : [Game] } for the year
+        :param graph: Graph | the year's linked graph
+        :param version: str | version of the bracket data including the new year
+        :param file_digest: bytes | hash of the year's raw file (see snapshot.hash_bracket_file), if known
+        :return: TournamentStore
+        """
+        new_store = copy.copy(self)
+        new_store.games_by_year = OrderedDict(sorted([*self.games_by_year.items(), (year, games)]))
+        new_store.graphs = dict(sorted([*self.graphs.items(), (year, graph)]))
+        new_store.version = version
+        new_store.file_digests = dict(self.file_digests)
+        if file_digest is not None:
+            new_store.file_digests[year] = file_digest
+        new_store.team_index = index.add_year_to_team_index(self.team_index, year, graph)
+        new_store.seed_index = index.add_year_to_seed_index(self.seed_index, year, graph, self.years())
+        new_store.name_index = index.add_year_to_name_index(self.name_index, games)
+        new_store.name_trie = index.add_year_to_name_trie(self.name_trie, games)
+        new_store.h2h_index = index.add_year_to_h2h_index(self.h2h_index, year, games)
+        new_store._table = None
+        return new_store
+
+
+_store = None  # shared store for this process, built lazily on first access
+_store_lock = threading.Lock()
+_update_lock = threading.Lock()  # one reload or ingestion at a time
+_reload_listeners = []  # callables run after the store is swapped (e.g. clearing result caches)
+
+
+def get_store() -> TournamentStore:
+    """
+    Returns the process-level store, building it on first use
+    :return: TournamentStore
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:  # another thread may have built it while we waited
+                _store = TournamentStore.build()
+    return _store
+
+
+def reload_store() -> TournamentStore:
+    """
+    Rebuilds the store from the data on disk & swaps it in for all future lookups
+    :return: newly built TournamentStore
+    """
+    with _update_lock:
+        new_store = TournamentStore.build()
+        swap_store(new_store)
+    return new_store
+
+
+def ingest_year(path: str, year: int = None) -> TournamentStore:
+    """
+    Adds a new tournament year from its bracket file, w/o rebuilding the other years
+     - only the new year is read, hashed, parsed & linked, requests keep using the current store until the new one is swapped in
+     - the file is copied into the data directory (if it isn't there already) only once it has been linked,
+       then the snapshot is rewritten outside the update lock, so the year is also loaded after a restart
+    :param path: bracket file, structured or legacy (see helpers/bracket_files.py)
+    :param year: int | tournament year, defaults to the year in the file name (bracket_{year}.jl)
+    :return: TournamentStore | the new store
+    """
+    year = search.get_year_from_path(path) if year is None else year
+    if year is None:
+        raise ValueError(f"Can't tell the tournament year of {path}, name it bracket_{{year}}.jl or pass the year")
+    with _update_lock:
+        current = get_store()
+        if year in current.graphs:
+            raise ValueError(f"Year {year} is already loaded, use reload_store to replace it")
+        games, graph = search.link_year(year, search.load_bracket_file(path))  # raises ChampionshipNotFoundError
+        with open(path, "rb") as f:
+            content = f.read()
+        file_digest = snapshot.hash_bracket_file(f"bracket_{year}.jl", content)
+        data_hash = snapshot.combine_digests({**current.file_digests, year: file_digest})
+        new_store = current.with_year(year, games, graph, data_hash.hex(), file_digest)
+        data_path = os.path.join(search.get_data_dir(), f"bracket_{year}.jl")
+        if not os.path.exists(data_path) or not os.path.samefile(path, data_path):
+            bf.write_atomic(data_path, content)
+        swap_store(new_store)
+    # a snapshot left behind by a concurrent update has a stale hash & is rebuilt on the next start
+    snapshot.save_snapshot(snapshot.get_snapshot_path(), data_hash, new_store.games_by_year, new_store.graphs)
+    print(f"[ingest_year] Added {year}")
+    return new_store
+
+
+def swap_store(new_store: TournamentStore):
+    """
+    Makes new_store the shared store & drops anything derived from the old one
+    """
+    global _store
+    with _store_lock:
+        _store = new_store
+    for callback in _reload_listeners:
+        callback()
+
+
+def on_reload(callback):
+    """
+    Registers a function to call whenever the store is rebuilt or a year is added, so anything derived from the old data can be dropped
+    :param callback: callable taking no arguments
+    :return: callback, so this can be used as a decorator
+    """
+    _reload_listeners.append(callback)
+    return callback
+
+
+on_reload(lambda: search.clear_result_caches())  # resolved at call time, search & store import each other
@@ -0,0 +1,88 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from ..helpers import string_formatting as sf
+
+
+class GameTable(object):
+
+    """
+    Columnar (struct-of-arrays) view of every game in every year
+     - row i of each array describes the same game, so cross-year questions become boolean masks over the arrays
+     - team ids index into team_names, keyed by the formatted name (same matching as the team search)
+     - parent holds the row of the game the winner played next, -1 for the top of the bracket & unlinked games
+    """
+
+    def __init__(self, games_by_year: OrderedDict):
+        rows = [(year, level, game) for year, games in games_by_year.items()
+                for level, level_games in games.items() for game in level_games]
+        row_ids = {game: i for i, (_, _, game) in enumerate(rows)}
+        team_ids = dict()  # formatted name -> team id
+        self.team_names = []  # display name of each team id (first spelling seen)
+
+        def team_id(name: str) -> int:
+            key = sf.format_string_for_comparison(name)
+            if key not in team_ids:
+                team_ids[key] = len(self.team_names)
+                self.team_names.append(name)
+            return team_ids[key]
+
+        n = len(rows)
+        self.year = np.empty(n, dtype=np.int16)
+        self.level = np.empty(n, dtype=np.int8)
+        self.round_number = np.empty(n, dtype=np.int16)  # 64, 32, ..., 2 or Team.RESULT_WIN_UNKNOWN_ROUND
+        self.is_championship = np.zeros(n, dtype=bool)
+        self.winner_id = np.empty(n, dtype=np.int32)
+        self.loser_id = np.empty(n, dtype=np.int32)
+        self.winner_seed = np.empty(n, dtype=np.int8)  # -1 when unseeded
+        self.loser_seed = np.empty(n, dtype=np.int8)
+        self.winner_score = np.empty(n, dtype=np.int16)
+        self.loser_score = np.empty(n, dtype=np.int16)
+        self.parent = np.full(n, -1, dtype=np.int32)
+        for i, (year, level, game) in enumerate(rows):
+            winner = game.get_winner()
+            loser = game.get_loser()
+            self.year[i] = year
+            self.level[i] = level
+            self.round_number[i] = game.get_round_number()
+            self.is_championship[i] = game.is_championship
+            self.winner_id[i] = team_id(winner.name)
+            self.loser_id[i] = team_id(loser.name)
+            self.winner_seed[i] = winner.seed
+            self.loser_seed[i] = loser.seed
+            self.winner_score[i] = winner.score
+            self.loser_score[i] = loser.score
+            if game.parent is not None:  # None until the graphs are constructed
+                self.parent[i] = row_ids[game.parent]
+        self.team_ids = team_ids
+
+    def __len__(self) -> int:
+        return len(self.year)
+
+    def get_team_id(self, team: str) -> int:
+        """
+        :param team: str | team name, any case / padding
+        :return: int | team id, -1 if the team never played in a tournament
+        """
+        return self.team_ids.get(sf.format_string_for_comparison(team), -1)
+
+    def years_seed_beat_seed(self, winner_seed: int, loser_seed: int) -> list[int]:
+        """
+        Years in which a team w/ winner_seed beat a team w/ loser_seed (e.g. 12 over 5)
+        :return: sorted list of years
+        """
+        mask = (self.winner_seed == winner_seed) & (self.loser_seed == loser_seed)
+        return np.unique(self.year[mask]).tolist()
+
+    def teams_in_round(self, round_number: int) -> list[tuple]:
+        """
+        Every team that played in a given round (e.g. 4 -> Final Four teams)
+        :param round_number: int | round as ranked in results (64, 32, ..., 2)
+        :return: list of tuple(year, team_name), ordered by year
+        """
+        mask = self.round_number == round_number
+        years = np.concatenate([self.year[mask], self.year[mask]])
+        ids = np.concatenate([self.winner_id[mask], self.loser_id[mask]])
+        order = np.argsort(years, kind="stable")
+        return [(int(years[i]), self.team_names[ids[i]]) for i in order]
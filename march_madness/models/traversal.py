@@ -0,0 +1,100 @@
+"""
+Traversal of a year's games from the championship down, w/ pluggable visitors
+ - a visitor is an object w/ a visit(game, depth) method, returning True stops the traversal early
+ - games are kept in a plain deque (no locking), & each game's depth in a second deque, so no tuple is made per game
+ - a game reachable along more than one path is visited once, at the depth it was first found
+"""
+
+from collections import deque
+
+from .game import Team
+from ..helpers import string_formatting as sf
+
+
+BFS = "bfs"  # level by level, higher -> lower round
+DFS = "dfs"  # down each branch before the next, children in bracket order
+
+
+def traverse(root, visitor, order: str = BFS, max_depth: int = None):
+    """
+    Visits every game below root (root included) until the visitor asks to stop
+    :param root: Game | first game visited, usually the championship
+    :param visitor: object w/ visit(game, depth) -> bool
+    :param order: BFS or DFS
+    :param max_depth: int | games deeper than this aren't visited (championship == depth 0), None for no limit
+    :return: visitor, for chaining e.g. traverse(root, TeamWinVisitor("Duke")).result
+    """
+    if order not in (BFS, DFS):
+        raise ValueError(f"Unknown traversal order '{order}', use '{BFS}' or '{DFS}'")
+    games = deque([root])
+    depths = deque([0])
+    explored = {root}
+    next_game, next_depth = (games.popleft, depths.popleft) if order == BFS else (games.pop, depths.pop)
+    visit = visitor.visit
+    while games:
+        game = next_game()
+        depth = next_depth()
+        if visit(game, depth):
+            break
+        if max_depth is not None and depth >= max_depth:
+            continue
+        children = game.children if order == BFS else reversed(game.children)  # stack -> push last child first
+        for child in children:
+            if child not in explored:
+                explored.add(child)
+                games.append(child)
+                depths.append(depth + 1)
+    return visitor
+
+
+class TeamWinVisitor(object):
+    """
+    Finds the first game (top-down) won by a team, i.e. its best result in the year
+     - result is (round number, None), or (Team.RESULT_NO_WINS, "") if the team never won, as returned by Graph.bfs
+    """
+    __slots__ = ("query", "result")
+
+    def __init__(self, team: str):
+        self.query = sf.format_string_for_comparison(team)
+        self.result = (Team.RESULT_NO_WINS, "")
+
+    def visit(self, game, depth: int) -> bool:
+        if sf.format_string_for_comparison(game.get_winner().name) == self.query:
+            self.result = (game.get_round_number(), None)
+            return True
+        return False
+
+
+class SeedWinVisitor(object):
+    """
+    Finds the first game (top-down) won by a seed
+     - result is (round number, winning team's name), or (Team.RESULT_NO_WINS, "") if the seed never won
+    """
+    __slots__ = ("seed", "result")
+
+    def __init__(self, seed: int):
+        self.seed = seed
+        self.result = (Team.RESULT_NO_WINS, "")
+
+    def visit(self, game, depth: int) -> bool:
+        winner = game.get_winner()
+        if winner.seed != -1 and winner.seed == self.seed:
+            self.result = (game.get_round_number(), winner.name)
+            return True
+        return False
+
+
+class GameCollector(object):
+    """
+    Collects every game visited, in visiting order, w/ its depth
+    """
+    __slots__ = ("games", "depths")
+
+    def __init__(self):
+        self.games = []
+        self.depths = []
+
+    def visit(self, game, depth: int) -> bool:
+        self.games.append(game)
+        self.depths.append(depth)
+        return False
@@ -0,0 +1,98 @@
+from ..helpers import string_formatting as sf
+
+
+class TrieNode(object):
+    __slots__ = ("children", "top")  # no per-instance __dict__, one node per distinct prefix
+
+    def __init__(self):
+        self.children = dict()  # next character -> TrieNode
+        self.top = ()  # best completions below this node, as tuple(name, appearances)
+
+    def copy(self):
+        node = TrieNode()
+        node.children = dict(self.children)
+        node.top = self.top
+        return node
+
+
+class PrefixTrie(object):
+
+    """
+    Autocomplete of team names, for lookups on every keystroke
+     - one node per character of each formatted name, so a lookup only walks the characters of the prefix
+     - each node stores its top k completions (most tournament appearances first) when built, nothing is ranked per query
+    """
+
+    def __init__(self, appearances: dict, k: int = 10):
+        """
+        :param appearances: dict | { team_name : # of tournaments played in }, names are matched case insensitively
+        :param k: int | max # of completions kept per prefix
+        """
+        self.k = k
+        self.root = TrieNode()
+        self.appearances = dict()  # formatted name -> tuple(team_name, appearances)
+        ranked = sorted(appearances.items(), key=lambda item: (-item[1], item[0]))  # best completions first
+        for name, count in ranked:
+            key = sf.format_string_for_comparison(name)
+            self.appearances[key] = (name, count)
+            node = self.root
+            self.add_completion(node, name, count)
+            for char in key:
+                node = node.children.setdefault(char, TrieNode())
+                self.add_completion(node, name, count)
+
+    def add_completion(self, node: TrieNode, name: str, count: int):
+        if len(node.top) < self.k:  # names arrive best first, so the first k are the top k
+            node.top += ((name, count),)
+
+    def get_appearances(self, team: str) -> int:
+        """
+        :return: int | # of tournaments the team played in, 0 if it isn't in the trie
+        """
+        return self.appearances.get(sf.format_string_for_comparison(team), ("", 0))[1]
+
+    def with_appearances(self, appearances: dict):
+        """
+        Returns a copy w/ new appearance counts, leaving this trie untouched for readers still using it
+         - counts may only grow (e.g. when a year is added), so each node's new top k comes from its old top k
+         - only nodes on the paths of the updated names are copied, the rest are shared w/ this trie
+        :param appearances: dict | { team_name : # of tournaments played in }, new names are added
+        :return: PrefixTrie
+        """
+        trie = PrefixTrie(dict(), self.k)
+        trie.root = self.root.copy()
+        trie.appearances = dict(self.appearances)
+        copied = {id(trie.root)}  # nodes owned by the new trie
+        for name, count in appearances.items():
+            key = sf.format_string_for_comparison(name)
+            name = trie.appearances.get(key, (name, 0))[0]  # keep the first spelling
+            trie.appearances[key] = (name, count)
+            node = trie.root
+            trie.update_completion(node, name, count)
+            for char in key:
+                child = node.children.get(char)
+                if child is None or id(child) not in copied:
+                    child = TrieNode() if child is None else child.copy()
+                    node.children[char] = child
+                    copied.add(id(child))
+                node = child
+                trie.update_completion(node, name, count)
+        return trie
+
+    def update_completion(self, node: TrieNode, name: str, count: int):
+        top = [completion for completion in node.top if completion[0] != name] + [(name, count)]
+        top.sort(key=lambda completion: (-completion[1], completion[0]))
+        node.top = tuple(top[:self.k])
+
+    def complete(self, prefix: str, limit: int = None) -> list[tuple]:
+        """
+        :param prefix: str | start of a team name, any case
+        :param limit: int | max # of completions, at most k
+        :return: list of tuple(team_name: str, appearances: int) | most appearances first
+        """
+        node = self.root
+        for char in sf.format_string_for_comparison(prefix):
+            node = node.children.get(char)
+            if node is None:  # no team starts w/ this prefix
+                return []
+        return list(node.top[:limit])
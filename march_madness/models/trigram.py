@@ -0,0 +1,117 @@
+import re
+from collections import defaultdict
+
+from ..helpers import string_formatting as sf
+
+
+PUNCTUATION = re.compile(r"[^a-z0-9 ]")  # e.g. "n.c. state" -> "nc state", "st. john's" -> "st johns"
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_for_trigrams(text: str) -> str:
+    """
+    :param text: raw team name or query
+    :return: str | lowercase name w/o punctuation & w/ single spaces
+    """
+    text = PUNCTUATION.sub("", sf.format_string_for_comparison(text))
+    return WHITESPACE.sub(" ", text)
+
+
+def get_trigrams(text: str) -> set:
+    """
+    :param text: normalized name
+    :return: set of str | every 3 character window, padded so the start & end of the name count more
+    """
+    padded = f"  {text} "
+    return {padded[i:i+3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex(object):
+
+    """
+    Fuzzy lookup of team names, for searches that don't exactly match a name in the data
+     - every distinct name is split into trigrams once, each trigram lists the names containing it
+     - a query only scores names sharing at least one trigram w/ it, never the full list of names
+     - score is the Jaccard similarity of the trigram sets (1.0 == same name once punctuation is dropped)
+    """
+
+    def __init__(self, names):
+        """
+        :param names: iterable of str | team names, any spelling of a name after the first is ignored
+        """
+        self.names = []  # display name of each name id
+        self.name_ids = dict()  # formatted name -> name id
+        self.trigram_counts = []  # size of each name's trigram set
+        self.postings = defaultdict(list)  # trigram -> [name id]
+        for name in names:
+            added = self.register_name(name)
+            if added is not None:
+                name_id, trigrams = added
+                for trigram in trigrams:
+                    self.postings[trigram].append(name_id)
+
+    def register_name(self, name: str) -> tuple:
+        """
+        Assigns a name id to a new name, posting lists are left to the caller
+        :return: tuple(name_id: int, trigrams: set), None if the name is already in the index
+        """
+        key = sf.format_string_for_comparison(name)
+        if key in self.name_ids:
+            return None
+        name_id = len(self.names)
+        self.name_ids[key] = name_id
+        self.names.append(name)
+        trigrams = get_trigrams(normalize_for_trigrams(name))
+        self.trigram_counts.append(len(trigrams))
+        return name_id, trigrams
+
+    def with_names(self, names):
+        """
+        Returns a copy that also holds names, leaving this index untouched for readers still using it
+         - only the posting lists of the new names' trigrams are copied, the rest are shared w/ this index
+        :param names: iterable of str | team names, names already in the index are ignored
+        :return: TrigramIndex
+        """
+        index = TrigramIndex(())
+        index.names = list(self.names)
+        index.name_ids = dict(self.name_ids)
+        index.trigram_counts = list(self.trigram_counts)
+        index.postings = defaultdict(list, self.postings)
+        copied = set()  # trigrams whose posting list belongs to the new index
+        for name in names:
+            added = index.register_name(name)
+            if added is not None:
+                name_id, trigrams = added
+                for trigram in trigrams:
+                    if trigram not in copied:
+                        index.postings[trigram] = list(index.postings[trigram])
+                        copied.add(trigram)
+                    index.postings[trigram].append(name_id)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return sf.format_string_for_comparison(name) in self.name_ids
+
+    def search(self, query: str, limit: int = 5, min_score: float = 0.3) -> list[tuple]:
+        """
+        Ranks the names most similar to a query
+        :param query: str | team name as typed by a user
+        :param limit: int | max # of candidates
+        :param min_score: float | candidates scoring lower are dropped
+        :return: list of tuple(name: str, score: float) | best -> worst
+        """
+        trigrams = get_trigrams(normalize_for_trigrams(query))
+        shared = defaultdict(int)  # name id -> # of trigrams in common w/ the query
+        for trigram in trigrams:
+            for name_id in self.postings.get(trigram, ()):
+                shared[name_id] += 1
+        candidates = []
+        for name_id, common in shared.items():
+            score = common / (len(trigrams) + self.trigram_counts[name_id] - common)
+            if score >= min_score:
+                candidates.append((self.names[name_id], score))
+        candidates.sort(key=lambda candidate: (-candidate[1], candidate[0]))
+        return candidates[:limit]
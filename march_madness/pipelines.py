@@ -4,10 +4,31 @@
 # See: https://docs.scrapy.org/en/latest/topics/item-pipeline.html
 
 
+import os
+
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
 
+from .helpers import bracket_files as bf
+
 
 class MarchMadnessPipeline:
+    """
+    Batches the games of each year & writes them as one structured bracket file per year when the crawl finishes
+     - files are written atomically (temp file + rename), so a crash mid-crawl never leaves a half written bracket
+     - the spider only yields a year's games when they changed, so untouched years keep their file
+    """
+
+    def open_spider(self, spider):
+        self.games_by_year = dict()  # { year : [game dict] }, in the order scraped
+
     def process_item(self, item, spider):
+        game = ItemAdapter(item).asdict()
+        self.games_by_year.setdefault(game["year"], []).append(game)
         return item
+
+    def close_spider(self, spider):
+        data_dir = getattr(spider, "data_dir", os.path.join("march_madness", "data"))
+        for year, games in self.games_by_year.items():
+            bf.write_atomic(os.path.join(data_dir, f"bracket_{year}.jl"), bf.serialize_games(games))
+            spider.log(f"Wrote {len(games)} games for {year}")
@@ -0,0 +1,11 @@
+"""
+Batch team, seed & head-to-head lookups, one JSON query per line in & one JSON result per line out
+
+    python -m march_madness.query queries.jl                 # answer the queries in a file
+    cat queries.jl | python -m march_madness.query           # ...or from stdin
+    python -m march_madness.query queries.jl --workers 4     # ...across 4 processes, for large batches
+
+Queries look like {"team": "Duke"}, {"seed": 12} or {"team": "Duke", "opponent": "Kansas"}, an "id" is echoed back.
+Results are written in the order of the queries, progress & errors loading the data go to stderr.
+Run from the repository root, the bracket data is found relative to the working directory.
+"""
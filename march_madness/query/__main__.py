@@ -0,0 +1,26 @@
+import argparse
+import sys
+
+from . import batch
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m march_madness.query", description="Batch team, seed & head-to-head lookups as JSON lines")
+    parser.add_argument("input", nargs="?", default="-", help="file w/ one JSON query per line (default: stdin)")
+    parser.add_argument("--workers", type=int, default=None, help="# of processes to answer the queries across (default: 1)")
+    parser.add_argument("--batch-size", type=int, default=batch.BATCH_SIZE, help="# of queries sent to a worker at a time (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    batch.load_store()  # once, before any workers are started
+    source = sys.stdin if args.input == "-" else open(args.input)
+    try:
+        for line in batch.stream_answers(source, args.workers, args.batch_size):
+            print(line, flush=True)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,112 @@
+import contextlib
+import json
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from ..models import payloads, store
+
+
+BATCH_SIZE = 256  # queries sent to a worker at a time
+
+
+class QueryError(ValueError):
+    """
+    Raised for a query that can't be answered, reported in its result line instead of stopping the batch
+    """
+
+
+def load_store():
+    """
+    Builds the shared store once per process, w/ anything printed while loading sent to stderr
+    """
+    with contextlib.redirect_stdout(sys.stderr):
+        store.get_store()
+
+
+def run_query(query: dict) -> dict:
+    """
+    Validates a single query & answers it w/ the same payloads as the JSON API (see models/payloads.py)
+     - {"team": name} -> best results by round
+     - {"seed": n} -> best results by round & team
+     - {"team": name, "opponent": name} -> head-to-head games
+    :param query: dict | parsed query line
+    :return: dict | result fields
+    """
+    if not isinstance(query, dict):
+        raise QueryError("query must be a JSON object")
+    if "team" in query:
+        team = query["team"]
+        if not isinstance(team, str):
+            raise QueryError("'team' must be a string")
+        if "opponent" in query:
+            if not isinstance(query["opponent"], str):
+                raise QueryError("'opponent' must be a string")
+            return payloads.get_matchup_payload(team, query["opponent"])
+        return payloads.get_team_payload(team)
+    if "seed" in query:
+        seed = query["seed"]
+        if not isinstance(seed, int) or isinstance(seed, bool):
+            raise QueryError("'seed' must be an integer")
+        return payloads.get_seed_payload(seed)
+    raise QueryError("query needs a 'team' or a 'seed'")
+
+
+def answer_line(line: str) -> str:
+    """
+    :param line: str | one JSON query
+    :return: str | one JSON result (w/o newline), w/ an "error" instead of results if the query can't be answered
+    """
+    try:
+        query = json.loads(line)
+    except json.JSONDecodeError as e:
+        return json.dumps({"error": f"invalid JSON: {e.msg}"})
+    response = {"id": query["id"]} if isinstance(query, dict) and "id" in query else dict()
+    try:
+        response.update(run_query(query))
+    except QueryError as e:
+        response["error"] = str(e)
+    return json.dumps(response)
+
+
+def answer_lines(lines: list[str]) -> list[str]:
+    return [answer_line(line) for line in lines]
+
+
+def get_batches(lines, size: int):
+    """
+    :return: generator of list of str | consecutive lines, size at a time
+    """
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if len(batch) > 0:
+        yield batch
+
+
+def stream_answers(lines, workers: int = None, batch_size: int = BATCH_SIZE):
+    """
+    Answers queries as they are read, in the order they were read
+     - w/ workers, batches of queries go to a process pool & only a few batches are in flight at a time,
+       so a large input is never read into memory at once
+    :param lines: iterable of str | JSON queries, blank lines are skipped
+    :param workers: int | # of processes, None or 1 answers in this process
+    :param batch_size: int | # of queries per task sent to a worker
+    :return: generator of str | one JSON result per query
+    """
+    lines = (line for line in lines if line.strip())
+    if workers is None or workers <= 1:
+        for line in lines:
+            yield answer_line(line)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=load_store) as pool:  # forked workers reuse the loaded store
+        pending = deque()
+        for batch in get_batches(lines, batch_size):
+            pending.append(pool.submit(answer_lines, batch))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while len(pending) > 0:
+            yield from pending.popleft().result()
@@ -1,61 +1,131 @@
 import scrapy
-import json
+import hashlib
+import os
+
+from .manifest import CrawlManifest, MANIFEST_FILENAME
+from ..helpers import bracket_files as bf
+from ..helpers import bracket_parsing as bp
+from ..items import MarchMadnessItem
 
 # Goal - AI search algorithm down tree
 # search farthest depth by seed
 # search farthest depth by team
 
 class GamesSpider(scrapy.Spider):
+    """
+    Downloads the bracket article for each tournament year as MarchMadnessItem games
+     - MarchMadnessPipeline writes each year's games to march_madness/data/bracket_{year}.jl
+     - the article URL varies erratically by year, so variants are tried one at a time until one succeeds
+     - the resolved URL, ETag / Last-Modified & file hash of each year are kept in a manifest (see manifest.py):
+       years in the manifest are requested directly (conditionally, once older than max_age) & unchanged files aren't rewritten
+     - arguments (scrapy crawl games -a name=value): years (e.g. "2018,2019"), data_dir, article_url, max_age (days)
+    """
+
     name = "games"
-    is_start = True  # indicates whether crawling first page or links
+    article_url = "https://www.ncaa.com/news/basketball-men/article/2020-05-{day}/{year}-{slug}"
+    slugs = (
+        "ncaa-tournament-bracket-scores-stats-records",
+        "ncaa-tournament-bracket-scores-stats-rounds",
+        "ncaa-tournament-brackets-scores-stats-records",
+    )
+
+    def __init__(self, years: str = None, data_dir: str = None, article_url: str = None, max_age: str = "30", *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.years = range(1939, 2020) if years is None else [int(year) for year in years.split(",")]
+        self.data_dir = os.path.join("march_madness", "data") if data_dir is None else data_dir
+        if article_url is not None:
+            self.article_url = article_url
+        self.max_age = float(max_age) * 24 * 60 * 60  # days -> seconds
+        self.manifest = CrawlManifest(os.path.join(self.data_dir, MANIFEST_FILENAME))
+
+    def get_bracket_path(self, year: int) -> str:
+        return os.path.join(self.data_dir, f"bracket_{year}.jl")
+
+    def get_candidate_urls(self, year: int) -> list[str]:
+        """
+        :return: list of str | every URL the year's article may be at, in the order they are tried
+        """
+        return [self.article_url.format(day=f"{d:02d}", year=year, slug=slug) for d in range(1, 32) for slug in self.slugs]
+
+    async def start(self):
+        for request in self.start_requests():
+            yield request
+
+    def start_requests(self):  # used directly by scrapy < 2.13
+        self.log("\n\n\n----- Crawling tournament years... ------")
+        for year in self.years:
+            entry = self.manifest.get(year)
+            if entry is None:  # URL never resolved
+                yield self.request_variant(year, 0)
+            elif not self.manifest.matches_file(year, self.get_bracket_path(year)):  # file missing or edited
+                yield self.request_known_url(year, conditional=False)
+            elif self.manifest.is_stale(year, self.max_age):
+                yield self.request_known_url(year, conditional=True)
+            else:
+                self.log(f"Year {year} is up to date, skipping")
 
-    start_urls = [
-        "https://www.ncaa.com/basketball-men/d1/every-ncaa-bracket-1939-today-tournament-stats-records"
-    ]
+    def request_variant(self, year: int, i: int) -> scrapy.Request:
+        """
+        :param i: int | index of the URL variant to try, the next one is only requested if this one fails
+        """
+        return scrapy.Request(self.get_candidate_urls(year)[i], callback=self.parse, errback=self.try_next_variant,
+                              meta={"year": year, "variant": i}, dont_filter=True)
+
+    def request_known_url(self, year: int, conditional: bool) -> scrapy.Request:
+        headers = self.manifest.conditional_headers(year) if conditional else dict()
+        return scrapy.Request(self.manifest.get(year)["url"], callback=self.parse, headers=headers,
+                              meta={"year": year, "handle_httpstatus_list": [304, 404, 410]}, dont_filter=True)
+
+    def try_next_variant(self, failure):
+        year = failure.request.meta["year"]
+        i = failure.request.meta["variant"] + 1
+        if i < len(self.get_candidate_urls(year)):
+            yield self.request_variant(year, i)
+        else:
+            self.log(f"No bracket found for year {year}")
 
     def parse(self, response):
-        if self.is_start:
-            # crawling home page, get outbound links
-            self.is_start = False  # update indicator
-            self.log("\n\n\n----- Crawling Home Page... ------")
-            #tournament_links = response.css('article.bro-hr a::attr(href)').getall()
-            # self.log(f' Found {len(tournament_links)} outbound links')
-            # self.log(tournament_links[0:2])
-            # for page in tournament_links:
-            #     yield response.follow(page, callback=self.parse)
-
-            # follow all links manually...
-            for year in range(1939, 2020):
-                # get all data - URL structure varies erratically so we need to do multiple requests to get data for all the tournaments
-                for d in range(1, 32):
-                    self.log(f"\n\nYear {year}")
-                    day = d if d > 9 else f"0{d}"
-                    yield response.follow(f"https://www.ncaa.com/news/basketball-men/article/2020-05-{day}/{year}-ncaa-tournament-bracket-scores-stats-records", callback=self.parse)
-                    yield response.follow(
-                        f"https://www.ncaa.com/news/basketball-men/article/2020-05-{day}/{year}-ncaa-tournament-bracket-scores-stats-rounds",
-                        callback=self.parse)
-                    yield response.follow(
-                        f"https://www.ncaa.com/news/basketball-men/article/2020-05-{day}/{year}-ncaa-tournament-brackets-scores-stats-records",
-                        callback=self.parse)
+        year = response.meta["year"]
+        if response.status == 304:  # unchanged since the last crawl
+            self.manifest.mark_checked(year)
+            return
+        if response.status in (404, 410):  # article moved -> resolve the URL again
+            self.manifest.remove(year)
+            yield self.request_variant(year, 0)
+            return
+
+        # crawling tournament pages
+        self.log(f"\n Crawling url {response.url}")
+        self.log(f"Tournament year: {year}")
+        filepath = self.get_bracket_path(year)
 
+        # Extract game data
+        scores_table = response.css('h2 + ul > li')  # gets scores data list items
+        titles = scores_table.css("li > em").xpath("text()").getall()
+        game_data = dict()
+        for i, block in enumerate(scores_table):
+            games = block.css('ul > li').getall()
+            if i < len(titles):
+               game_data[titles[i]] = games
+            else:  # some pages have unitalicized Final Four games
+                game_data["Final Four"] = games
+
+        items = []
+        for title, games in game_data.items():
+            for html in games:
+                teams = bp.parse_game(html)
+                if teams is not None:  # skip region headers
+                    seeds, names, scores = (list(field) for field in zip(*teams))
+                    items.append(MarchMadnessItem(year=year, tourney_round=title, teams=names, seeds=seeds, scores=scores))
+
+        sha256 = hashlib.sha256(bf.serialize_games(items)).hexdigest()  # hash of the file the pipeline will write
+        if self.manifest.matches_file(year, filepath) and self.manifest.get(year)["sha256"] == sha256:
+            self.log(f"Bracket for {year} unchanged")
         else:
-            # crawling tournament pages
-            self.log(f"\n Crawling url {response.url}")
-            year = response.url.split("/")[7][0:4]  # get tournament year from url
-            self.log(f"Tournament year: {year}")
-            filepath = f"march_madness/data/bracket_{year}.jl"
-
-            # Extract game data
-            scores_table = response.css('h2 + ul > li')  # gets scores data list items
-            titles = scores_table.css("li > em").xpath("text()").getall()
-            game_data = dict()
-            for i, block in enumerate(scores_table):
-                games = block.css('ul > li').getall()
-                if i < len(titles):
-                   game_data[titles[i]] = games
-                else:  # some pages have unitalicized Final Four games
-                    game_data["Final Four"] = games
-
-            with open(filepath, 'w') as f:
-                f.write(json.dumps(game_data))
-            self.log('parsed page!')
\ No newline at end of file
+            yield from items
+            self.log('parsed page!')
+        self.manifest.record(year, response.url, response.headers.get("ETag", b"").decode() or None,
+                             response.headers.get("Last-Modified", b"").decode() or None, sha256)
+
+    def closed(self, reason):
+        self.manifest.save()
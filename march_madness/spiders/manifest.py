@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+import time
+
+from ..helpers import bracket_files as bf
+
+
+MANIFEST_FILENAME = "crawl_manifest.json"
+
+
+def hash_file(path: str) -> str:
+    """
+    :param path: file to hash
+    :return: str | hex sha256 of the file's contents, None if the file doesn't exist
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class CrawlManifest(object):
+
+    """
+    Record of what the games spider resolved for each tournament year, so later crawls can skip work
+     - url is the article variant that served the bracket, so it is requested directly next time
+     - etag & last_modified come from the response headers, for conditional (304) requests
+     - sha256 is the hash of the bracket file written for the year, to skip rewriting unchanged files
+     - checked is when the year was last fetched or revalidated (seconds since the epoch)
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: JSON file the manifest is loaded from & saved to, missing == empty manifest
+        """
+        self.path = path
+        self.entries = dict()  # { year : entry }
+        if os.path.exists(path):
+            with open(path) as f:
+                self.entries = {int(year): entry for year, entry in json.load(f).items()}
+
+    def get(self, year: int) -> dict:
+        return self.entries.get(year)
+
+    def record(self, year: int, url: str, etag: str, last_modified: str, sha256: str):
+        self.entries[year] = {"url": url, "etag": etag, "last_modified": last_modified, "sha256": sha256,
+                              "checked": time.time()}
+
+    def mark_checked(self, year: int):
+        """
+        Marks a year as revalidated w/o changes (e.g. after a 304)
+        """
+        self.entries[year]["checked"] = time.time()
+
+    def remove(self, year: int):
+        self.entries.pop(year, None)
+
+    def matches_file(self, year: int, path: str) -> bool:
+        """
+        :return: bool | true if the year's bracket file still has the contents recorded in the manifest
+        """
+        entry = self.entries.get(year)
+        return entry is not None and entry["sha256"] == hash_file(path)
+
+    def is_stale(self, year: int, max_age: float) -> bool:
+        """
+        :param max_age: float | seconds a fetched year is trusted before it is revalidated
+        :return: bool | true if the year should be revalidated w/ the server
+        """
+        entry = self.entries.get(year)
+        return entry is None or time.time() - entry["checked"] > max_age
+
+    def conditional_headers(self, year: int) -> dict:
+        """
+        :return: dict | If-None-Match / If-Modified-Since headers for the year's last response
+        """
+        entry = self.entries.get(year, dict())
+        headers = dict()
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def save(self):
+        """
+        Writes the manifest atomically (via temp file + rename), so an interrupted crawl never leaves it half written
+        """
+        content = json.dumps({str(year): entry for year, entry in sorted(self.entries.items())}, indent=2)
+        bf.write_atomic(self.path, content.encode("utf-8"))
@@ -0,0 +1,142 @@
+import asyncio
+import json
+import time
+import unittest
+
+from flask import Flask
+
+from ..helpers import metrics
+from ..models import search
+from ..web.api import api, asgi_api
+
+
+class ApiTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        app = Flask(__name__)
+        app.register_blueprint(api)
+        cls.client = app.test_client()
+
+    def test_team(self):
+        response = self.client.get("/api/team/ rutgers")
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data["team"], "RUTGERS")
+        self.assertEqual(data["results"][0], {"round": 8, "label": "Round of 8", "years": [1976]})
+
+    def test_seed(self):
+        response = self.client.get("/api/seed/16")
+        self.assertEqual(response.status_code, 200)
+        best = response.get_json()["results"][0]
+        self.assertEqual(best["round"], 64)
+        self.assertIn({"team": "UMBC", "years": [2018]}, best["teams"])
+
+    def test_complete_team(self):
+        data = self.client.get("/api/teams/complete?q=KAN").get_json()
+        self.assertEqual(data["completions"][0]["team"], "Kansas")
+        appearances = [completion["appearances"] for completion in data["completions"]]
+        self.assertEqual(appearances, sorted(appearances, reverse=True))  # most appearances first
+        self.assertEqual(len(self.client.get("/api/teams/complete?q=n&limit=3").get_json()["completions"]), 3)
+        self.assertEqual(self.client.get("/api/teams/complete?q=zzz").get_json()["completions"], [])
+
+    def test_matchup(self):
+        data = self.client.get("/api/h2h/Kentucky/kansas").get_json()
+        self.assertEqual(data["teams"], [{"team": "KENTUCKY", "wins": 2}, {"team": "KANSAS", "wins": 1}])
+        self.assertEqual(data["games"][-1], {"year": 2012, "round": "2", "winner": "Kentucky", "score": [67, 59]})
+        self.assertEqual(self.client.get("/api/h2h/KANSAS/Kentucky").get_json()["games"], data["games"])
+        self.assertEqual(self.client.get("/api/h2h/Duke/North Carolina").get_json()["games"], [])
+
+    def test_invalid_seed(self):
+        self.assertEqual(self.client.get("/api/seed/abc").status_code, 404)
+
+    def test_etag(self):
+        first = self.client.get("/api/team/Duke")
+        etag = first.headers["ETag"]
+        self.assertEqual(self.client.get("/api/team/DUKE ", headers={"If-None-Match": etag}).status_code, 304)
+        self.assertEqual(self.client.get("/api/team/UNC", headers={"If-None-Match": etag}).status_code, 200)
+        seed_etag = self.client.get("/api/seed/1").headers["ETag"]
+        revalidated = self.client.get("/api/seed/1", headers={"If-None-Match": seed_etag})
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.headers["ETag"], seed_etag)
+
+
+    def asgi_get(self, path: str, query_string: bytes = b"", headers: list = (), drain_seconds: float = 0) -> dict:
+        """
+        Runs one request through asgi_api
+        :param drain_seconds: time the client takes to read the body, like a slow poller
+        :return: dict | status, headers & body sent
+        """
+        response = dict()
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = dict(message["headers"])
+            else:
+                await asyncio.sleep(drain_seconds)
+                response["body"] = message["body"]
+                response["finished"] = time.perf_counter()
+
+        scope = {"type": "http", "method": "GET", "path": path, "query_string": query_string, "headers": list(headers)}
+        return response, asgi_api(scope, receive, send)
+
+    def test_asgi(self):
+        async def run():
+            (team, team_call), (seed, seed_call) = self.asgi_get("/api/team/ rutgers"), self.asgi_get("/api/seed/16")
+            (missing, missing_call), (h2h, h2h_call) = self.asgi_get("/api/team/a/b"), self.asgi_get("/api/h2h/Kansas/Kentucky")
+            await asyncio.gather(team_call, seed_call, missing_call, h2h_call)
+            return team, seed, missing, h2h
+
+        team, seed, missing, h2h = asyncio.run(run())
+        self.assertEqual(team["status"], 200)
+        self.assertEqual(json.loads(team["body"]), self.client.get("/api/team/ rutgers").get_json())
+        self.assertEqual(json.loads(seed["body"]), self.client.get("/api/seed/16").get_json())
+        self.assertEqual(json.loads(h2h["body"])["teams"][1], {"team": "KENTUCKY", "wins": 2})
+        self.assertEqual(missing["status"], 404)
+
+        etag = team["headers"][b"etag"]
+        self.assertEqual(etag.decode(), self.client.get("/api/team/RUTGERS").headers["ETag"])
+        revalidated, call = self.asgi_get("/api/team/RUTGERS ", headers=[(b"if-none-match", etag)])
+        asyncio.run(call)
+        self.assertEqual(revalidated["status"], 304)
+
+    def test_asgi_slow_clients(self):
+        async def run():
+            slow = [self.asgi_get(f"/api/seed/{seed}", drain_seconds=1.0) for seed in (1, 2)]
+            fast = self.asgi_get("/api/team/Duke")
+            start = time.perf_counter()
+            await asyncio.gather(*(call for _, call in slow), fast[1])
+            return start, fast[0], [response for response, _ in slow]
+
+        start, fast, slow = asyncio.run(run())
+        self.assertLess(fast["finished"] - start, 0.5)  # not queued behind the slow clients
+        self.assertTrue(all(response["status"] == 200 for response in slow))
+
+    def test_asgi_metrics(self):
+        was_enabled = metrics.enabled
+        metrics.enable()
+        metrics.reset()
+        search.clear_result_caches()  # so the search stage is timed
+        try:
+            team, call = self.asgi_get("/api/team/Gonzaga")
+            asyncio.run(call)
+            missing, call = self.asgi_get("/api/teams")
+            asyncio.run(call)
+        finally:
+            metrics.enable(was_enabled)
+        self.assertEqual(team["status"], 200)
+        self.assertRegex(team["headers"][b"server-timing"].decode(), r"^search;dur=\d+\.\d{3}, request;dur=\d+\.\d{3}$")  # same stages as the Flask hooks
+        self.assertEqual(missing["status"], 404)
+        self.assertIn(b"server-timing", missing["headers"])
+        self.assertEqual(metrics.counters[("requests_total", (("endpoint", "api.team_results"), ("status", 200)))], 1)
+        self.assertEqual(metrics.counters[("requests_total", (("endpoint", None), ("status", 404)))], 1)
+        self.assertEqual(metrics.histograms["request"].count, 2)
+        metrics.reset()
+
+
+if __name__ == "__main__":
+    unittest.main()
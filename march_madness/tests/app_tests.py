@@ -0,0 +1,117 @@
+import copy
+import json
+import unittest
+
+from ..helpers import metrics
+from ..models import store
+
+
+class AppTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        try:
+            from ..web import app as web_app
+        except (ImportError, OSError) as e:  # flask not installed or web/keys.txt missing
+            raise unittest.SkipTest(f"web app can't be imported: {e}")
+        cls.web_app = web_app
+        cls.client = web_app.app.test_client()
+
+    def test_team_result(self):
+        response = self.client.get("/team/result/Virginia")
+        self.assertEqual(response.status_code, 200)
+        page = response.get_data(as_text=True)
+        self.assertIn("Team VIRGINIA", page)
+        self.assertIn("Won in <strong>CHAMPIONSHIP Round</strong> in 2019", page)
+        self.assertIn('href="/team/runs/VIRGINIA"', page)
+        self.assertNotIn("Did you mean", page)
+
+    def test_team_redirect(self):
+        response = self.client.get("/team/result/Conneticut")
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response.headers["Location"].endswith("/team/result/Connecticut"))
+
+    def test_team_suggestions(self):
+        response = self.client.get("/team/result/Carolina")  # no clear match
+        self.assertEqual(response.status_code, 200)
+        page = response.get_data(as_text=True)
+        self.assertIn("Did you mean", page)
+        self.assertIn('<a href="/team/result/North%20Carolina">North Carolina</a>', page)
+        self.assertIn("This team has never won a March Madness game", page)
+
+    def test_team_runs(self):
+        page = self.client.get("/team/runs/Virginia").get_data(as_text=True)
+        self.assertIn("Team VIRGINIA: Tournament Runs", page)
+        self.assertIn("<h2 class=\"pt-5 pb-2\">2019</h2>", page)
+        self.assertIn(": W vs. (3) Texas Tech 85 - 77</li>", page)
+        self.assertIn(": L vs. (16) UMBC 54 - 74</li>", page)  # 2018
+        self.assertIn("This team has never played in March Madness", self.client.get("/team/runs/zzqx").get_data(as_text=True))
+
+    def test_year_bracket(self):
+        text = self.client.get("/year/2019/bracket")
+        self.assertEqual(text.status_code, 200)
+        self.assertEqual(text.mimetype, "text/plain")
+        self.assertTrue(text.get_data(as_text=True).startswith("*Round of 2*"))
+
+        response = self.client.get("/year/2019/bracket?format=json")
+        self.assertEqual(response.mimetype, "application/json")
+        bracket = json.loads(response.get_data())
+        self.assertEqual(bracket["year"], 2019)
+        self.assertEqual(bracket["levels"][0][0]["winner"], "Virginia")
+        key = (store.get_store().version, 2019, "json")
+        self.assertEqual(self.web_app.bracket_cache.get(key), response.get_data())  # cached once fully sent
+        self.assertEqual(self.client.get("/year/2019/bracket?format=json").get_data(), response.get_data())
+
+        self.assertEqual(self.client.get("/year/2019/bracket?format=xml").status_code, 400)
+        self.assertEqual(self.client.get("/year/1800/bracket").status_code, 404)
+
+    def test_seed_result(self):
+        page = self.client.get("/seed/result/16").get_data(as_text=True)
+        self.assertIn("#16 Seed", page)
+        self.assertIn("<strong>UMBC</strong> in 2018", page)
+
+    def test_seed_summary(self):
+        response = self.client.get("/seed/summary")
+        self.assertEqual(response.status_code, 200)
+        page = response.get_data(as_text=True)
+        for seed in range(1, 17):
+            self.assertIn(f'<a href="/seed/result/{seed}">#{seed} Seed</a>', page)
+        self.assertIn("<strong>UMBC</strong> in 2018", page)
+
+    def test_metrics(self):
+        was_enabled = metrics.enabled
+        try:
+            metrics.enable(False)
+            self.assertEqual(self.client.get("/metrics").status_code, 404)
+            self.assertNotIn("Server-Timing", self.client.get("/seed/summary").headers)
+
+            metrics.enable()
+            metrics.reset()
+            response = self.client.get("/seed/summary")
+            self.assertRegex(response.headers["Server-Timing"], r"render;dur=\d+\.\d{3}")
+            output = self.client.get("/metrics").get_data(as_text=True)
+        finally:
+            metrics.enable(was_enabled)
+            metrics.reset()
+        self.assertIn('march_madness_requests_total{endpoint="seed_summary",status="200"} 1', output)
+        self.assertIn('march_madness_stage_seconds_count{stage="request"} 1', output)  # /metrics itself isn't finished yet
+        self.assertIn('march_madness_cache_hits_total{cache="page"}', output)
+
+    def test_page_cache_cleared_on_swap(self):
+        self.assertIn("<strong>UMBC</strong> in 2018", self.client.get("/seed/result/16").get_data(as_text=True))
+        self.assertGreater(len(self.web_app.page_cache), 0)
+        old = store.get_store()
+        new = copy.copy(old)
+        new.version, new.seed_index = "no seeds", dict()  # no seed ever won
+        try:
+            store.swap_store(new)
+            self.assertEqual(len(self.web_app.page_cache), 0)
+            page = self.client.get("/seed/result/16").get_data(as_text=True)
+            self.assertIn("No #16 Seed has ever won a March Madness game", page)
+        finally:
+            store.swap_store(old)
+        self.assertIn("<strong>UMBC</strong> in 2018", self.client.get("/seed/result/16").get_data(as_text=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+
+from ..benchmarks import suite
+
+
+class BenchmarksTestCase(unittest.TestCase):
+
+    def test_run(self):
+        benchmarks = {benchmark.name: benchmark for benchmark in suite.get_benchmarks()}
+        for name in ("load_all_data", "load_data_for_year", "construct_graphs", "trawl_graph", "bfs_team", "bfs_seed"):
+            self.assertIn(name, benchmarks)
+        results = suite.run_benchmarks([benchmarks["bfs_seed"]], repeat=1)["bfs_seed"]
+        self.assertEqual(results["calls"], len(suite.BFS_SEEDS) * len(suite.search.get_tournament_years()))
+        self.assertLessEqual(results["p50_ms"], results["p95_ms"])
+        self.assertLessEqual(results["p95_ms"], results["p99_ms"])
+        self.assertGreater(results["peak_kib"], 0)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(suite.percentile(values, 50), 50)
+        self.assertEqual(suite.percentile(values, 99), 99)
+        self.assertEqual(suite.percentile([7], 95), 7)
+
+    def test_compare_to_baseline(self):
+        baseline = {"bfs_team": {"best_ms": 10.0, "peak_kib": 100.0}}
+        self.assertEqual(suite.compare_to_baseline({"bfs_team": {"best_ms": 11.0, "peak_kib": 150.0}}, baseline), [])
+        regressions = suite.compare_to_baseline({"bfs_team": {"best_ms": 20.0, "peak_kib": 1000.0}}, baseline)
+        self.assertEqual(len(regressions), 2)
+        self.assertEqual(suite.compare_to_baseline({"new": {"best_ms": 1.0, "peak_kib": 1.0}}, baseline), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
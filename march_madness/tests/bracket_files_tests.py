@@ -0,0 +1,79 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from ..helpers import bracket_files as bf
+from ..models.search import *
+from ..pipelines import MarchMadnessPipeline
+
+
+class CrawlStub(object):
+    # stand-in for the spider, the pipeline only needs its data_dir & log
+    def __init__(self, data_dir: str):
+        self.data_dir = data_dir
+
+    def log(self, message: str):
+        pass
+
+
+class BracketFilesTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def write_structured(self, year: int) -> str:
+        """
+        Converts a legacy bracket file in the data directory to a structured one in the temp directory
+        """
+        games = [{"year": year, "tourney_round": tourney_round, "teams": [name for _, name, _ in teams],
+                  "seeds": [seed for seed, _, _ in teams], "scores": [score for _, _, score in teams]}
+                 for tourney_round, teams_by_game in bf.read_bracket_file(os.path.join(get_data_dir(), f"bracket_{year}.jl")).items()
+                 for teams in teams_by_game]
+        path = os.path.join(self.tmp_dir.name, f"bracket_{year}.jl")
+        bf.write_atomic(path, bf.serialize_games(games))
+        return path
+
+    def test_structured_matches_legacy(self):
+        for year in (1939, 1985, 1992, 2019):  # 1992 has a 3 team game
+            legacy = load_data_for_year(year)
+            structured = load_bracket_file(self.write_structured(year))
+            self.assertEqual(list(structured.keys()), list(legacy.keys()))
+            for level, games in legacy.items():
+                self.assertEqual([g.get_game_summary() for g in structured[level]], [g.get_game_summary() for g in games])
+                self.assertEqual([len(g.teams) for g in structured[level]], [len(g.teams) for g in games])
+
+    def test_pipeline_batches_years(self):
+        pipeline = MarchMadnessPipeline()
+        spider = CrawlStub(self.tmp_dir.name)
+        pipeline.open_spider(spider)
+        games = [{"year": 2000, "tourney_round": "National Semifinals", "teams": ["Duke", "Kansas"], "seeds": [1, 4], "scores": [82, 55]},
+                 {"year": 2001, "tourney_round": "National Championship", "teams": ["Duke", "Arizona"], "seeds": [1, 2], "scores": [82, 72]},
+                 {"year": 2000, "tourney_round": "National Championship", "teams": ["Duke", "Kentucky"], "seeds": [1, 2], "scores": [75, 70]}]
+        for game in games:
+            pipeline.process_item(game, spider)
+        self.assertEqual(os.listdir(self.tmp_dir.name), [])  # nothing written until the crawl finishes
+        pipeline.close_spider(spider)
+        self.assertEqual(sorted(os.listdir(self.tmp_dir.name)), ["bracket_2000.jl", "bracket_2001.jl"])
+        rounds = bf.read_bracket_file(os.path.join(self.tmp_dir.name, "bracket_2000.jl"))
+        self.assertEqual(list(rounds.keys()), ["National Semifinals", "National Championship"])
+        self.assertEqual(rounds["National Championship"], [[(1, "Duke", 75), (2, "Kentucky", 70)]])
+
+    def test_concurrent_atomic_writes(self):
+        path = os.path.join(self.tmp_dir.name, "bracket_2000.jl")
+        contents = [str(i).encode("utf-8") * 100000 for i in range(8)]
+        threads = [threading.Thread(target=bf.write_atomic, args=(path, content)) for content in contents]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with open(path, "rb") as f:
+            self.assertIn(f.read(), contents)  # one whole write wins
+        self.assertEqual(os.listdir(self.tmp_dir.name), ["bracket_2000.jl"])  # no temp files left behind
+
+
+if __name__ == '__main__':
+    unittest.main()
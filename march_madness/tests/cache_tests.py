@@ -0,0 +1,119 @@
+import contextlib
+import copy
+import io
+import time
+import unittest
+
+from ..helpers.cache import LRUCache
+from ..models import search, store
+from ..models.game import Team
+
+
+class CacheTestCase(unittest.TestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)  # "b" is now least recently used
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(len(cache), 2)
+
+    def test_ttl(self):
+        cache = LRUCache(maxsize=2, ttl=0.01)
+        cache.put("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_configure_ttl(self):
+        cache = LRUCache(maxsize=2, ttl=0.01)
+        cache.configure(maxsize=4)
+        self.assertEqual((cache.maxsize, cache.ttl), (4, 0.01))  # ttl left as is
+        cache.configure(ttl=None)  # no expiry, as in the constructor
+        self.assertIsNone(cache.ttl)
+        cache.put("a", 1)
+        time.sleep(0.02)
+        self.assertEqual(cache.get("a"), 1)
+
+    def test_verbose_on_cache_hit(self):
+        outputs = []
+        for _ in range(2):  # miss, then hit
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                search.search_for_team("Rutgers")
+                search.search_for_seed(11)
+            outputs.append(output.getvalue())
+        self.assertIn("Best result for 'RUTGERS'", outputs[0])
+        self.assertEqual(outputs[1], outputs[0])
+
+    def test_counters(self):
+        cache = LRUCache(maxsize=2)
+        cache.get("a")
+        cache.put("a", 1)
+        cache.get("a")
+        cache.get("a")
+        self.assertEqual(cache.stats()["hits"], 2)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_team_search_shares_normalized_entry(self):
+        search.clear_result_caches()
+        hits = search.team_cache.hits
+        expected = search.search_for_team("Rutgers")
+        self.assertEqual(search.search_for_team(" rutgers"), expected)
+        self.assertEqual(search.search_for_team("RUTGERS "), expected)
+        self.assertEqual(search.team_cache.hits - hits, 2)
+
+    def test_cached_results_are_copies(self):
+        search.clear_result_caches()
+        results = search.search_for_seed(12)
+        results.clear()  # modifying a result must not affect the next search
+        self.assertNotEqual(search.search_for_seed(12), {})
+
+    def test_cleared_on_reload(self):
+        search.search_for_team("Rutgers")
+        self.assertGreater(len(search.team_cache), 0)
+        store.reload_store()
+        self.assertEqual(len(search.team_cache), 0)
+
+    def test_swap_during_search(self):
+        old = store.get_store()
+        new = copy.copy(old)
+        new.version, new.team_index, new.seed_index = "new", dict(), dict()  # no team or seed ever won
+        racing = copy.copy(old)
+        racing.version = "racing"
+        racing.team_index, racing.seed_index = SwappingIndex(old.team_index, new), SwappingIndex(old.seed_index, new)
+        try:
+            store.swap_store(racing)
+            self.assertNotEqual(search.search_for_team("Rutgers"), {Team.RESULT_NO_WINS: new.years()})  # put after the swap
+            self.assertEqual(search.search_for_team("Rutgers"), {Team.RESULT_NO_WINS: new.years()})
+            store.swap_store(racing)
+            self.assertNotEqual(search.search_for_seed(1), {Team.RESULT_NO_WINS: {"": new.years()}})
+            self.assertEqual(search.search_for_seed(1), {Team.RESULT_NO_WINS: {"": new.years()}})
+        finally:
+            store.swap_store(old)
+
+
+class SwappingIndex(dict):
+    """
+    Index that swaps in another store when read, i.e. while a search is still using the store it belongs to
+    """
+
+    def __init__(self, entries: dict, new_store):
+        super().__init__(entries)
+        self.new_store = new_store
+
+    def get(self, key, default=None):
+        store.swap_store(self.new_store)
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        store.swap_store(self.new_store)
+        return super().__contains__(key)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
-from ..models.game import Team
+from ..models.game import Game, Team
+from ..helpers import bracket_parsing as bp
 
 class NodeTestCase(unittest.TestCase):
 
@@ -24,6 +25,37 @@ class NodeTestCase(unittest.TestCase):
         self.assertEqual(team.seed, -1)
         self.assertEqual(team.score, 73)
 
+    def test_parse_game_region_prefix(self):
+        html = '<li><strong>East: No. 11\u00a0Belmont 81, </strong>No. 11 Temple 70</li>'
+        self.assertEqual(bp.parse_game(html), [(11, "Belmont", 81), (11, "Temple", 70)])
+
+    def test_parse_game_missing_comma(self):
+        html = '<li><strong>No. 7 Texas 87\u00a0</strong>No. 10 Arizona State 85</li>'
+        self.assertEqual(bp.parse_game(html), [(7, "Texas", 87), (10, "Arizona State", 85)])
+
+    def test_parse_game_overtime(self):
+        html = '<li><strong>USC 66</strong>, Santa Clara 65 (2OT)</li>'
+        self.assertEqual(bp.parse_game(html), [(-1, "USC", 66), (-1, "Santa Clara", 65)])
+
+    def test_parse_game_video_link(self):
+        html = '<li><strong>No. 1 Georgetown 84</strong>, No. 2 Houston 75 | <strong><a href="https://www.youtube.com/watch?v=egKfyb3p52g&amp;t=6s">Watch full game</a></strong></li>'
+        self.assertEqual(bp.parse_game(html), [(1, "Georgetown", 84), (2, "Houston", 75)])
+
+    def test_parse_game_region_header(self):
+        html = '<li>East Regional\n\t\t<ul>\n\t\t\t<li><strong>No. 1 Duke 85,\u00a0</strong>No. 16 North Dakota State 62</li>'
+        self.assertIsNone(bp.parse_game(html))
+
+    def test_game_is_compact(self):
+        game = Game("No. 1 Duke 85, No. 16 North Dakota State 62", "First Round (Round of 64)")
+        other = Game("No. 2 Michigan State 76, No. 15 Bradley 65", "First Round (Round of 64)")
+        self.assertFalse(hasattr(game, "__dict__"))
+        self.assertFalse(hasattr(game.team1, "__dict__"))
+        self.assertEqual(game.children, ())
+        self.assertTrue(game.is_leaf())
+        other.children = (game,)
+        self.assertEqual(game.children, ())  # children are per instance
+        self.assertEqual(game.get_round_number(), 64)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
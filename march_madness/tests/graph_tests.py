@@ -1,6 +1,8 @@
+import json
 import unittest
 
 from ..models.search import *
+from ..models import store
 
 class NodeTestCase(unittest.TestCase):
 
@@ -72,6 +74,71 @@ class NodeTestCase(unittest.TestCase):
         self.assertIn("UMBC", set(teams))
         self.assertIn(2018, set(years))
 
+    def test_store_built_once(self):
+        shared = store.get_store()
+        self.assertIs(shared, store.get_store())
+        self.assertEqual(shared.years(), list(range(1939, 2020)))
+
+    def test_team_index_matches_bfs(self):
+        team_index = store.get_store().team_index
+        for team in ["Duke", "Rutgers", "Villanova", "UMBC"]:
+            best_by_year = team_index[team.lower()]
+            for year, graph in self.full_graph.items():
+                _, (result, _) = graph.bfs(year, team=team)
+                self.assertEqual(best_by_year.get(year, Team.RESULT_NO_WINS), result)
+
+    def test_seed_index_matches_bfs(self):
+        seed_index = store.get_store().seed_index
+        for seed in range(1, 17):
+            round_by_year = {year: result for result, years_by_team in seed_index[seed].items()
+                             for years in years_by_team.values() for year in years}
+            for year, graph in self.full_graph.items():
+                _, (result, _) = graph.bfs(year, seed=seed)
+                self.assertEqual(round_by_year[year], result)
+
+    def test_parallel_build_matches_serial(self):
+        gby = load_all_data(workers=4)
+        graphs = construct_graphs(gby, workers=4)
+        self.assertEqual(list(graphs.keys()), list(self.full_graph.keys()))
+        for year, graph in graphs.items():
+            self.assertEqual(sorted(graph.show().split("\n")), sorted(self.full_graph[year].show().split("\n")))
+            self.assertIn(graph.championship, [g for games in gby[year].values() for g in games])
+
+    def test_team_run(self):
+        run = self.full_graph[2019].team_run("virginia")
+        self.assertEqual([game.tourney_round for game in run], ["64", "32", "16", "8", "4", "2"])
+        self.assertIs(run[-1], self.full_graph[2019].championship)
+        run = self.full_graph[2018].team_run("UMBC")
+        self.assertEqual([game.get_winner().name for game in run], ["UMBC", "Kansas State"])  # eliminated in 2nd game
+        self.assertEqual(self.full_graph[2019].team_run("Rutgers"), [])
+        run = self.full_graph[1944].team_run("Utah")  # older bracket w/ named rounds
+        self.assertEqual([game.tourney_round for game in run], ["quarterfinals", "semifinals", "2"])
+
+    def test_search_for_team_runs(self):
+        runs = search_for_team_runs("Villanova")
+        self.assertEqual(len(runs[2018]), 6)
+        self.assertEqual(len(runs[2017]), 2)
+        self.assertNotIn(2012, runs)
+
+    def test_serialize_bracket(self):
+        graph = self.full_graph[2019]
+        chunks = list(graph.iter_text())
+        self.assertEqual([len(chunk.splitlines()) for chunk in chunks], [1, 2, 4, 8, 16, 32, 4])  # one chunk per level
+        self.assertEqual("".join(chunks), graph.show(verbose=False))
+        data = json.loads("".join(graph.iter_json()))
+        self.assertEqual(data["year"], 2019)
+        champ = data["levels"][0][0]
+        self.assertEqual((champ["id"], champ["winner"], champ["children"]), (0, "Virginia", [1, 2]))
+        games = [game for level in data["levels"] for game in level]
+        self.assertEqual([game["id"] for game in games], list(range(len(games))))
+        self.assertEqual(len(games), len(list(graph.games_breadth_first())))
+
+    def test_search_all_seeds(self):
+        results = search_for_seeds()
+        self.assertEqual(list(results.keys()), list(range(1, 17)))
+        for seed, seed_results in results.items():
+            self.assertEqual(seed_results, search_for_seed(seed))
+
     def test_1939(self):
         graph = self.full_graph[1939].show()
         self.assertEqual(graph.split("\n")[0], "*Round of 2* 	 Oregon beat Ohio State 46 - 33")
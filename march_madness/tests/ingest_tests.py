@@ -0,0 +1,106 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from collections import OrderedDict
+
+from ..models import search, snapshot, store
+from ..models.store import TournamentStore
+
+
+class IngestTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.full = store.get_store()
+        cls.data_dir = search.get_data_dir()
+
+    def without_year(self, year: int) -> TournamentStore:
+        games_by_year = OrderedDict((y, games) for y, games in self.full.games_by_year.items() if y != year)
+        graphs = {y: graph for y, graph in self.full.graphs.items() if y != year}
+        return TournamentStore(games_by_year, graphs)
+
+    def test_with_year_matches_full_build(self):
+        for year in (2019, 1985):  # newest & a year in the middle
+            partial = self.without_year(year)
+            added = partial.with_year(year, self.full.games_by_year[year], self.full.graphs[year], "v2")
+            self.assertEqual(added.years(), self.full.years())
+            self.assertEqual(added.team_index, self.full.team_index)
+            self.assertEqual(added.seed_index, self.full.seed_index)
+            self.assertEqual(added.h2h_index, self.full.h2h_index)
+            self.assertEqual(set(added.name_index.name_ids), set(self.full.name_index.name_ids))
+            self.assertEqual(added.name_index.search("Vilanova"), self.full.name_index.search("Vilanova"))
+            for prefix in ("", "v", "kan", "north c"):
+                self.assertEqual(added.name_trie.complete(prefix), self.full.name_trie.complete(prefix))
+            self.assertNotIn(year, partial.years())  # copy on write, readers of the old store see no change
+            self.assertNotIn(year, partial.team_index["villanova"])
+
+    def test_ingest_year(self):
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            data_dir = os.path.join(tmp_dir, "march_madness", "data")
+            os.makedirs(data_dir)
+            for year in (2017, 2018):
+                shutil.copy(os.path.join(self.data_dir, f"bracket_{year}.jl"), data_dir)
+            try:
+                os.chdir(tmp_dir)
+                self.assertEqual(search.get_tournament_years(), [2017, 2018])
+                old_store = store.reload_store()
+                self.assertEqual(search.search_for_team("Villanova"), {64: [2017], 2: [2018]})
+
+                new_store = store.ingest_year(os.path.join(self.data_dir, "bracket_2019.jl"))
+                self.assertIs(store.get_store(), new_store)
+                self.assertEqual(new_store.years(), [2017, 2018, 2019])
+                self.assertEqual(old_store.years(), [2017, 2018])
+                self.assertNotEqual(new_store.version, old_store.version)
+                self.assertEqual(search.search_for_team("Villanova"), {64: [2017, 2019], 2: [2018]})  # cache was cleared
+                self.assertEqual(search.get_tournament_years(), [2017, 2018, 2019])  # copied into data/
+                self.assertEqual(new_store.version, snapshot.compute_data_hash().hex())  # only the new file was hashed
+                self.assertIsNotNone(snapshot.read_snapshot(snapshot.get_snapshot_path(), bytes.fromhex(new_store.version)))
+                self.assertEqual(store.reload_store().years(), [2017, 2018, 2019])  # loaded from the new snapshot
+                with self.assertRaises(ValueError):
+                    store.ingest_year(os.path.join(self.data_dir, "bracket_2019.jl"))
+
+                with open(os.path.join(self.data_dir, "bracket_2016.jl")) as f:
+                    rounds = json.loads(f.readline())
+                partial_path = os.path.join(tmp_dir, "bracket_2016.jl")
+                with open(partial_path, "w") as f:  # first 2 rounds only
+                    json.dump(dict(list(rounds.items())[:2]), f)
+                with self.assertRaises(search.ChampionshipNotFoundError):
+                    store.ingest_year(partial_path)
+                self.assertEqual(search.get_tournament_years(), [2017, 2018, 2019])  # not copied into data/
+                self.assertEqual(store.get_store().years(), [2017, 2018, 2019])
+            finally:
+                os.chdir(cwd)
+                store.reload_store()
+
+    def test_incomplete_year_skipped(self):
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            data_dir = os.path.join(tmp_dir, "march_madness", "data")
+            os.makedirs(data_dir)
+            shutil.copy(os.path.join(self.data_dir, "bracket_2019.jl"), data_dir)
+            with open(os.path.join(self.data_dir, "bracket_2019.jl")) as f:
+                rounds = json.loads(f.readline())
+            with open(os.path.join(data_dir, "bracket_2020.jl"), "w") as f:  # First Four & first 2 rounds only
+                json.dump(dict(list(rounds.items())[:3]), f)
+            try:
+                os.chdir(tmp_dir)
+                for workers in (None, 2):
+                    games_by_year = search.load_all_data()
+                    self.assertEqual({level: len(games) for level, games in games_by_year[2020].items()}, {0: 4, 1: 32, 2: 16})
+                    graphs = search.construct_graphs(games_by_year, workers)
+                    self.assertEqual(list(graphs.keys()), [2019])
+                    self.assertEqual(list(games_by_year.keys()), [2019])
+                new_store = store.reload_store()
+                self.assertEqual(new_store.years(), [2019])
+                self.assertEqual(search.search_for_team("Virginia"), {2: [2019]})
+                self.assertEqual(store.reload_store().years(), [2019])  # from the snapshot
+            finally:
+                os.chdir(cwd)
+                store.reload_store()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from ..helpers import metrics
+
+
+class MetricsTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.was_enabled = metrics.enabled
+        metrics.reset()
+
+    def tearDown(self) -> None:
+        metrics.enable(self.was_enabled)
+        metrics.reset()
+
+    def test_disabled(self):
+        metrics.enable(False)
+        self.assertIs(metrics.stage("bfs"), metrics.NOOP_TIMER)
+        with metrics.stage("bfs"):
+            pass
+        metrics.increment("requests_total", {"endpoint": "index"})
+        self.assertEqual(metrics.histograms, dict())
+        self.assertEqual(metrics.counters, dict())
+
+    def test_stage_histogram(self):
+        metrics.enable()
+        for _ in range(3):
+            with metrics.stage("bfs"):
+                pass
+        metrics.observe("render", 10.0)  # above every bucket
+        self.assertEqual(metrics.histograms["bfs"].count, 3)
+        self.assertEqual(metrics.histograms["render"].counts[-1], 1)
+
+        output = metrics.render({("cache_hits_total", (("cache", "team"),)): 7})
+        self.assertIn('march_madness_stage_seconds_bucket{stage="bfs",le="+Inf"} 3', output)
+        self.assertIn('march_madness_stage_seconds_bucket{stage="render",le="2.5"} 0', output)
+        self.assertIn('march_madness_stage_seconds_count{stage="render"} 1', output)
+        self.assertIn('march_madness_cache_hits_total{cache="team"} 7', output)
+
+    def test_request_timings(self):
+        metrics.enable()
+        metrics.start_request()
+        metrics.observe("search", 0.001)
+        metrics.observe("render", 0.002)
+        metrics.observe("search", 0.0005)
+        timings = metrics.finish_request()
+        self.assertEqual(len(timings), 3)
+        self.assertEqual(metrics.format_server_timing(timings), "search;dur=1.500, render;dur=2.000")
+        metrics.observe("search", 0.001)  # outside a request, histogram only
+        self.assertEqual(metrics.finish_request(), [])
+
+    def test_counters(self):
+        metrics.enable()
+        metrics.increment("requests_total", {"status": 200, "endpoint": "index"})
+        metrics.increment("requests_total", {"endpoint": "index", "status": 200})
+        self.assertIn('march_madness_requests_total{endpoint="index",status="200"} 2', metrics.render())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -155,6 +155,14 @@ class NodeTestCase(unittest.TestCase):
         self.assertEqual(winner, "Virginia")
         self.assertEqual(loser, "Texas Tech")
 
+    def test_no_championship(self):
+        games = OrderedDict([(0, [Game("No. 1 Duke 85, No. 16 North Dakota State 62", "First Round"),
+                                  Game("No. 2 Michigan State 76, No. 15 Bradley 65", "First Round")])])
+        with self.assertRaises(ChampionshipNotFoundError) as context:
+            trawl_graph(games, 2019)
+        self.assertEqual(context.exception.year, 2019)
+        self.assertEqual(context.exception.games_per_level, {0: 2})
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,52 @@
+import json
+import subprocess
+import sys
+import unittest
+
+from ..query import batch
+
+
+class QueryTestCase(unittest.TestCase):
+
+    def answer(self, query) -> dict:
+        return json.loads(batch.answer_line(json.dumps(query)))
+
+    def test_team(self):
+        result = self.answer({"team": " rutgers", "id": "a"})
+        self.assertEqual(result["id"], "a")
+        self.assertEqual(result["team"], "RUTGERS")
+        self.assertEqual(result["results"][0], {"round": 8, "label": "Round of 8", "years": [1976]})
+
+    def test_seed(self):
+        best = self.answer({"seed": 16})["results"][0]
+        self.assertEqual(best["round"], 64)
+        self.assertIn({"team": "UMBC", "years": [2018]}, best["teams"])
+
+    def test_matchup(self):
+        result = self.answer({"team": "Kansas", "opponent": "Kentucky"})
+        self.assertEqual(result["teams"], [{"team": "KANSAS", "wins": 1}, {"team": "KENTUCKY", "wins": 2}])
+        self.assertEqual(len(result["games"]), 3)
+
+    def test_errors(self):
+        self.assertIn("invalid JSON", json.loads(batch.answer_line("{team: Duke}"))["error"])
+        self.assertEqual(self.answer({"seed": "1", "id": 3}), {"id": 3, "error": "'seed' must be an integer"})
+        self.assertIn("error", self.answer({"seed": True}))
+        self.assertIn("error", self.answer(["Duke"]))
+        self.assertIn("error", self.answer({"year": 2019}))
+
+    def test_workers_match_serial(self):
+        lines = [json.dumps({"seed": seed}) for seed in range(1, 17)] + ["", json.dumps({"team": "Duke"})]
+        serial = list(batch.stream_answers(lines))
+        self.assertEqual(len(serial), 17)  # blank line skipped
+        self.assertEqual(list(batch.stream_answers(lines, workers=2, batch_size=3)), serial)
+
+    def test_cli_stdout_is_json_lines(self):
+        queries = "\n".join(json.dumps(query) for query in ({"team": "Duke"}, {"seed": 1}, {"team": "UMBC", "opponent": "Virginia"}))
+        output = subprocess.run([sys.executable, "-m", "march_madness.query"], input=queries, capture_output=True, text=True, check=True).stdout
+        results = [json.loads(line) for line in output.splitlines()]
+        self.assertEqual([result.get("team", result.get("seed")) for result in results[:2]], ["DUKE", 1])
+        self.assertEqual(results[2]["games"][0]["winner"], "UMBC")
+
+
+if __name__ == '__main__':
+    unittest.main()
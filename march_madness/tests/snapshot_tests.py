@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..models.search import *
+from ..models import snapshot
+
+
+class SnapshotTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.gby = load_all_data()
+        cls.full_graph = construct_graphs(cls.gby)
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmp_dir.name, snapshot.SNAPSHOT_FILENAME)
+        cls.data_hash = snapshot.compute_data_hash()
+        snapshot.write_snapshot(cls.path, cls.data_hash, cls.gby, cls.full_graph)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        gby, graphs = snapshot.read_snapshot(self.path, self.data_hash)
+        self.assertEqual(list(gby.keys()), list(self.gby.keys()))
+        for year, games in self.gby.items():
+            self.assertEqual(list(gby[year].keys()), list(games.keys()))
+            for level, level_games in games.items():
+                expected = [(g.get_game_summary(), sorted(c.get_game_summary() for c in g.children)) for g in level_games]
+                loaded = [(g.get_game_summary(), sorted(c.get_game_summary() for c in g.children)) for g in gby[year][level]]
+                self.assertEqual(loaded, expected)
+            self.assertEqual(sorted(graphs[year].show().split("\n")), sorted(self.full_graph[year].show().split("\n")))
+
+    def test_championship(self):
+        _, graphs = snapshot.read_snapshot(self.path, self.data_hash)
+        champ = graphs[2019].championship
+        self.assertTrue(champ.is_championship)
+        self.assertEqual(champ.get_winner().name, "Virginia")
+        self.assertEqual(champ.get_loser().name, "Texas Tech")
+
+    def test_parents(self):
+        gby, graphs = snapshot.read_snapshot(self.path, self.data_hash)
+        for year, games in self.gby.items():
+            flat = [g for level_games in games.values() for g in level_games]
+            loaded = [g for level_games in gby[year].values() for g in level_games]
+            positions = {g: i for i, g in enumerate(loaded)}
+            self.assertEqual([positions.get(g.parent) for g in loaded], [flat.index(g.parent) if g.parent else None for g in flat])
+        self.assertEqual(graphs[1944].team_run("Utah")[-1].get_game_summary(), self.full_graph[1944].championship.get_game_summary())
+
+    def test_stale_hash(self):
+        self.assertIsNone(snapshot.read_snapshot(self.path, bytes(32)))
+
+    def test_missing_file(self):
+        self.assertIsNone(snapshot.read_snapshot(os.path.join(self.tmp_dir.name, "missing.snapshot")))
+
+    def test_corrupt_file(self):
+        path = os.path.join(self.tmp_dir.name, "corrupt.snapshot")
+        with open(self.path, "rb") as f:
+            content = f.read()
+        for corrupt in (content[:len(content) // 2], content[:-1], content + b"\0",  # truncated / trailing bytes
+                        content[:snapshot.HEADER.size] + b"\xff" * 64 + content[snapshot.HEADER.size + 64:]):  # bad string table
+            with open(path, "wb") as f:
+                f.write(corrupt)
+            self.assertIsNone(snapshot.read_snapshot(path, self.data_hash))
+
+        with open(path, "wb") as f:
+            f.write(content[:len(content) // 2])
+        gby, graphs = snapshot.load_or_build(path, data_hash=self.data_hash)  # rebuilt instead of raising
+        self.assertEqual(list(gby.keys()), list(self.gby.keys()))
+        self.assertIsNotNone(snapshot.read_snapshot(path, self.data_hash))
+
+    def test_hash_covers_loaded_files(self):
+        with tempfile.TemporaryDirectory() as data_dir:
+            for year in (2018, 2019):
+                shutil.copy(os.path.join(get_data_dir(), f"bracket_{year}.jl"), data_dir)
+            data_hash = snapshot.compute_data_hash(data_dir)
+            for stray in ("bracket_old.jl", "old_bracket_2019.jl", "bracket_2019.jl.bak"):  # never loaded
+                with open(os.path.join(data_dir, stray), "w") as f:
+                    f.write("{}")
+            self.assertEqual(get_tournament_years(data_dir), [2018, 2019])
+            self.assertEqual(snapshot.compute_data_hash(data_dir), data_hash)
+            with open(os.path.join(data_dir, "bracket_2019.jl"), "a") as f:
+                f.write("\n")
+            self.assertNotEqual(snapshot.compute_data_hash(data_dir), data_hash)
+
+    def test_unwritable_snapshot(self):
+        path = os.path.join(self.tmp_dir.name, "missing_dir", snapshot.SNAPSHOT_FILENAME)  # e.g. a read-only data directory
+        gby, graphs = snapshot.load_or_build(path, data_hash=self.data_hash)  # built anyway, only the cache is skipped
+        self.assertEqual(list(gby.keys()), list(self.gby.keys()))
+        self.assertEqual(graphs[2019].championship.get_winner().name, "Virginia")
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ..helpers import bracket_files as bf
+from ..spiders.manifest import MANIFEST_FILENAME
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+ARTICLE_PATH = "/news/basketball-men/article/2020-05-{day}/{year}-{slug}"
+
+
+class BracketHandler(BaseHTTPRequestHandler):
+    """
+    Local stand-in for the bracket articles, serves the fixture page at one URL variant per year
+    """
+
+    pages = dict()  # path -> page body
+    requests = []  # tuple(path, conditional: bool) for every request made
+
+    def do_GET(self):
+        conditional = "If-None-Match" in self.headers
+        BracketHandler.requests.append((self.path, conditional))
+        body = self.pages.get(self.path)
+        if body is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class GamesSpiderTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        with open(os.path.join(FIXTURE_DIR, "bracket_page.html"), "rb") as f:
+            cls.page = f.read()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), BracketHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.article_url = f"http://127.0.0.1:{cls.server.server_port}{ARTICLE_PATH}"
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        BracketHandler.pages = {
+            ARTICLE_PATH.format(day="03", year=2000, slug="ncaa-tournament-bracket-scores-stats-rounds"): self.page,
+            ARTICLE_PATH.format(day="01", year=2001, slug="ncaa-tournament-bracket-scores-stats-records"): self.page,
+        }
+        BracketHandler.requests = []
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def crawl(self, max_age: str = "30"):
+        BracketHandler.requests = []
+        subprocess.run([sys.executable, "-m", "scrapy", "crawl", "games", "-a", "years=2000,2001",
+                        "-a", f"data_dir={self.tmp_dir.name}", "-a", f"article_url={self.article_url}",
+                        "-a", f"max_age={max_age}", "-s", "ROBOTSTXT_OBEY=False", "-s", "LOG_LEVEL=ERROR",
+                        "-s", "TELNETCONSOLE_ENABLED=False"], check=True)
+        return BracketHandler.requests
+
+    def read_manifest(self) -> dict:
+        with open(os.path.join(self.tmp_dir.name, MANIFEST_FILENAME)) as f:
+            return json.load(f)
+
+    def test_stops_at_first_working_variant(self):
+        requests = self.crawl()
+        year_2000 = [path for path, _ in requests if "/2000-" in path]
+        self.assertEqual(len(year_2000), 8)  # 2 days x 3 variants fail, then the 2nd variant on day 3 works
+        self.assertTrue(year_2000[-1] in BracketHandler.pages)
+        self.assertEqual(len([path for path, _ in requests if "/2001-" in path]), 1)
+
+        manifest = self.read_manifest()
+        self.assertEqual(manifest["2001"]["url"], self.article_url.format(day="01", year=2001, slug="ncaa-tournament-bracket-scores-stats-records"))
+        self.assertIsNotNone(manifest["2001"]["etag"])
+        rounds = bf.read_bracket_file(os.path.join(self.tmp_dir.name, "bracket_2000.jl"))  # structured file
+        self.assertEqual(list(rounds.keys()), ["National Semifinals", "National Championship"])
+        self.assertEqual(rounds["National Championship"], [[(1, "Duke", 75), (2, "Kentucky", 70)]])
+        self.assertEqual(sorted(os.listdir(self.tmp_dir.name)), ["bracket_2000.jl", "bracket_2001.jl", MANIFEST_FILENAME])
+
+    def test_later_runs_skip_or_revalidate(self):
+        self.crawl()
+        path = os.path.join(self.tmp_dir.name, "bracket_2000.jl")
+        modified = os.stat(path).st_mtime_ns
+        self.assertEqual(self.crawl(), [])  # nothing is stale
+        requests = self.crawl(max_age="0")
+        self.assertEqual(len(requests), 2)  # one conditional request per year
+        self.assertTrue(all(conditional for _, conditional in requests))
+        self.assertEqual(os.stat(path).st_mtime_ns, modified)  # 304 -> file not rewritten
+
+    def test_refetches_changed_and_missing_years(self):
+        self.crawl()
+        os.remove(os.path.join(self.tmp_dir.name, "bracket_2001.jl"))
+        url_2000 = ARTICLE_PATH.format(day="03", year=2000, slug="ncaa-tournament-bracket-scores-stats-rounds")
+        BracketHandler.pages[url_2000] = self.page.replace(b"Duke 75", b"Duke 76")
+        requests = self.crawl(max_age="0")
+        self.assertEqual(len(requests), 2)  # known URLs are requested directly
+        rounds = bf.read_bracket_file(os.path.join(self.tmp_dir.name, "bracket_2000.jl"))
+        self.assertEqual(rounds["National Championship"], [[(1, "Duke", 76), (2, "Kentucky", 70)]])
+        self.assertTrue(os.path.exists(os.path.join(self.tmp_dir.name, "bracket_2001.jl")))
+
+
+if __name__ == '__main__':
+    unittest.main()
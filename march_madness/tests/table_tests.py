@@ -0,0 +1,58 @@
+import unittest
+
+from ..models.search import *
+from ..models.table import GameTable
+
+
+class TableTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.gby = load_all_data()
+        cls.unlinked = GameTable(cls.gby)  # straight from the loaded data
+        cls.full_graph = construct_graphs(cls.gby)
+        cls.table = GameTable(cls.gby)
+
+    def test_rows(self):
+        n_games = sum(len(games) for year in self.gby.values() for games in year.values())
+        self.assertEqual(len(self.table), n_games)
+        self.assertEqual(len(self.unlinked), n_games)
+
+    def test_12_over_5(self):
+        years = self.table.years_seed_beat_seed(12, 5)
+        self.assertIn(2019, years)
+        self.assertNotIn(1939, years)
+
+    def test_16_over_1(self):
+        self.assertEqual(self.table.years_seed_beat_seed(16, 1), [2018])
+
+    def test_final_four(self):
+        teams = [team for year, team in self.table.teams_in_round(4) if year == 2019]
+        self.assertEqual(set(teams), {"Virginia", "Texas Tech", "Auburn", "Michigan State"})
+
+    def test_championships(self):
+        champs = self.table.is_championship
+        self.assertEqual(champs.sum(), len(self.full_graph))
+        row = int(((self.table.year == 2019) & champs).nonzero()[0][0])
+        self.assertEqual(self.table.team_names[self.table.winner_id[row]], "Virginia")
+        self.assertEqual(self.table.get_team_id("  virginia"), self.table.winner_id[row])
+
+    def test_parents(self):
+        self.assertTrue((self.unlinked.parent == -1).all())
+        linked = self.table.parent != -1
+        self.assertTrue(linked.any())
+        # a game's parent is played by its winner, at the same or a later level
+        parents = self.table.parent[linked]
+        winners = self.table.winner_id[linked]
+        self.assertTrue(((self.table.winner_id[parents] == winners) | (self.table.loser_id[parents] == winners)).all())
+
+    def test_parents_match_games(self):
+        games = [game for year in self.gby.values() for level_games in year.values() for game in level_games]
+        rows = {game: i for i, game in enumerate(games)}
+        self.assertEqual(self.table.parent.tolist(), [rows[game.parent] if game.parent is not None else -1 for game in games])
+        champs = self.table.is_championship.nonzero()[0]
+        self.assertTrue((self.table.parent[champs] == -1).all())  # incl. 1944 - 1949, where the championship lists itself as a child
+
+
+if __name__ == "__main__":
+    unittest.main()
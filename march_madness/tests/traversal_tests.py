@@ -0,0 +1,51 @@
+import contextlib
+import io
+import unittest
+
+from ..models import store, traversal
+from ..models.game import Team
+
+
+class TraversalTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.graph = store.get_store().graphs[2019]
+
+    def test_bfs_order(self):
+        collector = self.graph.traverse(traversal.GameCollector())
+        self.assertIs(collector.games[0], self.graph.championship)
+        self.assertEqual(collector.depths, sorted(collector.depths))  # level by level
+        self.assertEqual(collector.games, list(self.graph.games_breadth_first()))
+        self.assertEqual(len(collector.games), 67)
+
+    def test_dfs_order(self):
+        collector = self.graph.traverse(traversal.GameCollector(), traversal.DFS)
+        self.assertEqual([game.tourney_round for game in collector.games[:6]], ["2", "4", "8", "16", "32", "64"])
+        self.assertEqual(set(collector.games), set(self.graph.games_breadth_first()))
+
+    def test_max_depth(self):
+        collector = self.graph.traverse(traversal.GameCollector(), max_depth=2)
+        self.assertEqual(len(collector.games), 7)  # championship, final four, elite eight
+        self.assertEqual(self.graph.traverse(traversal.TeamWinVisitor("UMBC"), max_depth=2).result, (Team.RESULT_NO_WINS, ""))
+
+    def test_early_exit(self):
+        visitor = self.graph.traverse(traversal.SeedWinVisitor(5))
+        self.assertEqual(visitor.result, (8, "Auburn"))
+        self.assertEqual(self.graph.traverse(traversal.TeamWinVisitor(" virginia")).result, (2, None))
+        self.assertEqual(self.graph.traverse(traversal.TeamWinVisitor("Rutgers")).result, (Team.RESULT_NO_WINS, ""))
+
+    def test_invalid_order(self):
+        with self.assertRaises(ValueError):
+            self.graph.traverse(traversal.GameCollector(), "random")
+
+    def test_bfs_is_quiet(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.assertEqual(self.graph.bfs(2019, team="Virginia"), (2019, (2, None)))
+            self.assertEqual(self.graph.bfs(2019, seed=12), (2019, (32, "Oregon")))
+        self.assertEqual(out.getvalue(), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,24 @@
+import unittest
+
+from ..models.trie import PrefixTrie
+
+
+class TrieTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.trie = PrefixTrie({"Kansas": 48, "Kansas State": 31, "Kentucky": 59, "Kent State": 6}, k=3)
+
+    def test_ranked_by_appearances(self):
+        self.assertEqual(self.trie.complete("k"), [("Kentucky", 59), ("Kansas", 48), ("Kansas State", 31)])  # top k only
+        self.assertEqual(self.trie.complete("Ken"), [("Kentucky", 59), ("Kent State", 6)])
+
+    def test_case_insensitive(self):
+        self.assertEqual(self.trie.complete(" KANSAS S"), [("Kansas State", 31)])
+
+    def test_limit_and_missing_prefix(self):
+        self.assertEqual(self.trie.complete("ka", limit=1), [("Kansas", 48)])
+        self.assertEqual(self.trie.complete("duke"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
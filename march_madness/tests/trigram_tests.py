@@ -0,0 +1,34 @@
+import unittest
+
+from ..models import search
+from ..models.trigram import TrigramIndex, normalize_for_trigrams
+
+
+class TrigramTestCase(unittest.TestCase):
+
+    def test_normalize(self):
+        self.assertEqual(normalize_for_trigrams(" N.C.  State"), "nc state")
+        self.assertEqual(normalize_for_trigrams("St. John's"), "st johns")
+
+    def test_ranked_candidates(self):
+        name_index = TrigramIndex(["Connecticut", "Central Connecticut State", "Kentucky", "connecticut"])
+        self.assertEqual(len(name_index), 3)  # spellings of the same formatted name are kept once
+        results = name_index.search("Conneticut")
+        self.assertEqual([name for name, _ in results], ["Connecticut", "Central Connecticut State"])
+        self.assertGreater(results[0][1], results[1][1])
+        self.assertEqual(name_index.search("xyz"), [])
+
+    def test_ignores_punctuation(self):
+        name_index = TrigramIndex(["St. John's", "St. Joseph's"])
+        self.assertEqual(name_index.search("St Johns")[0], ("St. John's", 1.0))
+
+    def test_resolve_team(self):
+        self.assertEqual(search.resolve_team("rutgers "), ("rutgers ", []))  # exact match is kept as typed
+        self.assertEqual(search.resolve_team("Kentuky"), ("Kentucky", []))
+        resolved, suggestions = search.resolve_team("north carolina st")  # several close teams
+        self.assertIsNone(resolved)
+        self.assertIn("North Carolina", suggestions)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+"""
+JSON versions of the team, seed & head-to-head searches, for dashboards that poll results
+ - served by the Flask blueprint under WSGI, or natively under ASGI by asgi_api (see web/asgi.py), both from the same lookups
+ - responses carry an ETag derived from the bracket data version & the formatted query, so a matching
+   If-None-Match is answered w/ 304 before any lookup is done
+"""
+
+import hashlib
+import json
+import re
+import time
+from urllib.parse import parse_qs
+
+from flask import Blueprint, Response, jsonify, request
+from werkzeug.http import parse_etags, quote_etag
+
+from ..models import index, payloads, store
+from ..helpers import metrics
+from ..helpers import string_formatting as sf
+
+
+api = Blueprint("api", __name__, url_prefix="/api")
+COMPLETION_LIMIT = 8  # default # of team name completions
+
+
+def make_etag(kind: str, query: str) -> str:
+    """
+    :param kind: type of search (e.g. "team")
+    :param query: formatted search input
+    :return: str | ETag, changes whenever the bracket data changes
+    """
+    return hashlib.sha1(f"{store.get_store().version}:{kind}:{query}".encode("utf-8")).hexdigest()
+
+
+def not_modified(etag: str) -> Response:
+    """
+    :param etag: current ETag for the request
+    :return: 304 response if the client already has this version, None otherwise
+    """
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    return None
+
+
+def with_etag(payload: dict, etag: str) -> Response:
+    response = jsonify(payload)
+    response.set_etag(etag)
+    return response
+
+
+def respond(kind: str, query: str, build_payload) -> Response:
+    """
+    :param kind: type of search (e.g. "team")
+    :param query: formatted search input, for the ETag
+    :param build_payload: callable returning the JSON payload, only called if the client's copy is stale
+    :return: 304 or JSON response, w/ an ETag
+    """
+    etag = make_etag(kind, query)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+    return with_etag(build_payload(), etag)
+
+
+@api.route('/team/<team>')
+def team_results(team):
+    return respond(*team_lookup(team))
+
+
+@api.route('/teams/complete')
+def complete_team():
+    return respond(*completion_lookup(request.args.get("q", ""), request.args.get("limit")))
+
+
+@api.route('/h2h/<team_a>/<team_b>')
+def matchup_results(team_a, team_b):
+    return respond(*matchup_lookup(team_a, team_b))
+
+
+@api.route('/seed/<int:seed>')
+def seed_results(seed):
+    return respond(*seed_lookup(seed))
+
+
+# each lookup returns tuple(kind, formatted query, build_payload), shared by the Flask views & asgi_api
+
+def team_lookup(team: str) -> tuple:
+    return "team", sf.format_string_for_comparison(team), lambda: payloads.get_team_payload(team)
+
+
+def seed_lookup(seed: int) -> tuple:
+    return "seed", str(seed), lambda: payloads.get_seed_payload(seed)
+
+
+def matchup_lookup(team_a: str, team_b: str) -> tuple:
+    return "h2h", ":".join(index.get_matchup_key(team_a, team_b)), lambda: payloads.get_matchup_payload(team_a, team_b)
+
+
+def completion_lookup(query: str, limit: str = None) -> tuple:
+    """
+    :param query: str | start of a team name as typed
+    :param limit: str | max # of completions from the query string, COMPLETION_LIMIT if missing or invalid
+    """
+    query = sf.format_string_for_comparison(query)
+    limit = max(int(limit), 0) if limit is not None and limit.lstrip("-").isdigit() else COMPLETION_LIMIT
+    return "complete", f"{query}:{limit}", lambda: payloads.get_completion_payload(query, limit)
+
+
+API_PATHS = [  # (path pattern, Flask endpoint, lookup from the match & query string), same routes as the blueprint
+    (re.compile(r"/api/team/([^/]+)"), "api.team_results", lambda match, args: team_lookup(match[1])),
+    (re.compile(r"/api/seed/(\d+)"), "api.seed_results", lambda match, args: seed_lookup(int(match[1]))),
+    (re.compile(r"/api/h2h/([^/]+)/([^/]+)"), "api.matchup_results", lambda match, args: matchup_lookup(match[1], match[2])),
+    (re.compile(r"/api/teams/complete"), "api.complete_team",
+     lambda match, args: completion_lookup(args.get("q", ""), args.get("limit"))),
+]
+
+
+def match_api_path(path: str, query_string: str) -> tuple:
+    """
+    :param path: str | request path, percent-decoded
+    :param query_string: str | raw query string
+    :return: tuple(endpoint, lookup) | lookup is tuple(kind, formatted query, build_payload) as returned by the lookups,
+        (None, None) if no route matches
+    """
+    args = {key: values[0] for key, values in parse_qs(query_string).items()}
+    for pattern, endpoint, lookup in API_PATHS:
+        match = pattern.fullmatch(path)
+        if match is not None:
+            return endpoint, lookup(match, args)
+    return None, None
+
+
+async def asgi_api(scope, receive, send):
+    """
+    Native ASGI version of the blueprint (see web/asgi.py)
+     - lookups only read the in-memory store (microseconds, no I/O), so they run right on the event loop
+     - each request is its own coroutine, a client reading its response slowly only holds up its own send
+     - w/ metrics enabled, requests are timed & counted like the Flask routes (see app.py's before/after_request hooks)
+    """
+    timed = metrics.enabled
+    if timed:
+        start = time.perf_counter()
+        metrics.start_request()
+    endpoint, response = get_asgi_response(scope)
+    server_timing = None
+    if timed:
+        metrics.observe("request", time.perf_counter() - start)
+        server_timing = metrics.format_server_timing(metrics.finish_request())
+        metrics.increment("requests_total", {"endpoint": endpoint, "status": response[0]})
+    await send_response(send, *response, server_timing=server_timing)
+
+
+def get_asgi_response(scope) -> tuple:
+    """
+    :param scope: ASGI http scope
+    :return: tuple(endpoint, tuple(status, body, content type, ETag, content length)) | endpoint is None if no route matches
+    """
+    endpoint, lookup = match_api_path(scope["path"], scope["query_string"].decode("latin-1"))
+    if lookup is None:
+        return None, (404, b"Not Found", "text/plain", None, None)
+    if scope["method"] not in ("GET", "HEAD"):
+        return endpoint, (405, b"Method Not Allowed", "text/plain", None, None)
+    kind, query, build_payload = lookup
+    etag = make_etag(kind, query)
+    headers = dict(scope["headers"])
+    if parse_etags(headers.get(b"if-none-match", b"").decode("latin-1")).contains(etag):
+        return endpoint, (304, b"", None, etag, None)
+    body = json.dumps(build_payload()).encode("utf-8")
+    return endpoint, (200, body if scope["method"] == "GET" else b"", "application/json", etag, len(body))
+
+
+async def send_response(send, status: int, body: bytes, content_type: str = None, etag: str = None, length: int = None,
+                        server_timing: str = None):
+    headers = []
+    if content_type is not None:
+        headers.append((b"content-type", content_type.encode("latin-1")))
+        headers.append((b"content-length", str(len(body) if length is None else length).encode("latin-1")))
+    if etag is not None:
+        headers.append((b"etag", quote_etag(etag).encode("latin-1")))
+    if server_timing is not None:
+        headers.append((b"server-timing", server_timing.encode("latin-1")))
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
@@ -1,9 +1,14 @@
 import os
-from flask import Flask, render_template, redirect, url_for
+import time
+
+from flask import Flask, Response, abort, g, render_template, redirect, request, url_for
 from flask_bootstrap import Bootstrap
 
-from ..models import search
+from ..models import search, store
+from ..helpers import metrics
 from ..helpers import string_formatting as sf
+from ..helpers.cache import LRUCache
+from .api import api
 from .form import SeedForm, TeamForm
 
 
@@ -11,6 +16,51 @@ app = Flask(__name__)
 with open(os.path.join(os.getcwd(), "march_madness/web/keys.txt")) as f:
     app.config['SECRET_KEY'] = f.read()
 Bootstrap(app)
+app.register_blueprint(api)  # JSON endpoints under /api
+store.get_store()  # parse & link all tournament years once at startup, shared by every request
+app.config.setdefault("PAGE_CACHE_SIZE", search.RESULT_CACHE_SIZE)
+app.config.setdefault("PAGE_CACHE_TTL", search.RESULT_CACHE_TTL)
+page_cache = LRUCache(app.config["PAGE_CACHE_SIZE"], app.config["PAGE_CACHE_TTL"])  # rendered result pages, keyed on the store version
+store.on_reload(page_cache.clear)
+app.config.setdefault("BRACKET_CACHE_SIZE", 256)  # room for every year in both formats
+bracket_cache = LRUCache(app.config["BRACKET_CACHE_SIZE"])  # serialized brackets, keyed on (store version, year, format)
+store.on_reload(bracket_cache.clear)
+BRACKET_FORMATS = {"text": "text/plain", "json": "application/json"}
+
+
+@app.before_request
+def start_request_timing():
+    if metrics.enabled:
+        g.request_start = time.perf_counter()
+        metrics.start_request()
+
+
+@app.after_request
+def add_server_timing(response):
+    """
+    Adds the stages timed during the request to the response as a Server-Timing header (only w/ metrics enabled)
+    """
+    if metrics.enabled and "request_start" in g:
+        metrics.observe("request", time.perf_counter() - g.request_start)
+        response.headers["Server-Timing"] = metrics.format_server_timing(metrics.finish_request())
+        metrics.increment("requests_total", {"endpoint": request.endpoint, "status": response.status_code})
+    return response
+
+
+@app.route('/metrics')
+def show_metrics():
+    """
+    Stage timings, request counts & cache hits in Prometheus text format, 404 unless metrics are enabled
+    :return:
+    """
+    if not metrics.enabled:
+        abort(404)
+    cache_counters = dict()
+    for cache_name, cache in (("team", search.team_cache), ("seed", search.seed_cache), ("page", page_cache)):
+        stats = cache.stats()
+        cache_counters[("cache_hits_total", (("cache", cache_name),))] = stats["hits"]
+        cache_counters[("cache_misses_total", (("cache", cache_name),))] = stats["misses"]
+    return Response(metrics.render(cache_counters), mimetype="text/plain; version=0.0.4")
 
 
 @app.route('/')
@@ -36,6 +86,19 @@ def team_form():
 
 @app.route('/team/result/<team>')
 def search_by_team(team):
+    query = sf.format_string_for_comparison(team)
+    key = ("team", store.get_store().version, query)  # a page rendered while the store is swapped is never hit
+    page = page_cache.get(key)
+    if page is None:
+        resolved, suggestions = search.resolve_team(team)
+        if resolved is not None and sf.format_string_for_comparison(resolved) != query:  # misspelled, clear match
+            return redirect(url_for("search_by_team", team=resolved))
+        page = render_team_results(team, suggestions)
+        page_cache.put(key, page)
+    return page
+
+
+def render_team_results(team: str, suggestions: list[str] = ()) -> str:
     best_round = "1000"
     best_years = ""
     other_results = []
@@ -54,7 +117,73 @@ def search_by_team(team):
                 else:
                     other_results.append((formatted_round, ', '.join(y)))
             counter += 1
-    return render_template("team_result.html", team=sf.format_string_for_display(team), best_round=best_round, best_years=best_years, other=other_results)
+    with metrics.stage("render"):
+        return render_template("team_result.html", team=sf.format_string_for_display(team), best_round=best_round, best_years=best_years, other=other_results, suggestions=suggestions)
+
+
+@app.route('/team/runs/<team>')
+def team_runs(team):
+    """
+    Every game a team played in each tournament, from its first game to its elimination
+    :return:
+    """
+    key = ("runs", store.get_store().version, sf.format_string_for_comparison(team))
+    page = page_cache.get(key)
+    if page is None:
+        runs = [(year, [format_run_game(game, team) for game in games]) for year, games in search.search_for_team_runs(team).items()]
+        with metrics.stage("render"):
+            page = render_template("team_runs.html", team=sf.format_string_for_display(team), runs=runs)
+        page_cache.put(key, page)
+    return page
+
+
+def format_run_game(game, team: str) -> tuple:
+    """
+    Formats one game of a team's run for display
+    :param game: Game | played by team
+    :param team: str | name
+    :return: tuple(round: str, result: "W" or "L", opponent: str, score: str) | score is team's - opponent's
+    """
+    winner, loser = game.get_winner(), game.get_loser()
+    won = sf.format_string_for_comparison(winner.name) == sf.format_string_for_comparison(team)
+    opponent = loser if won else winner
+    if game.tourney_round.isdigit():  # numbered round or unmarked (preliminary) round
+        round_label = search.format_round_number(game.get_round_number(), 1)
+    else:  # e.g. "regional semifinals" in older brackets
+        round_label = game.tourney_round.title()
+    opponent_name = f"({opponent.seed}) {opponent.name}" if opponent.seed != -1 else opponent.name
+    score = f"{winner.score} - {loser.score}" if won else f"{loser.score} - {winner.score}"
+    return round_label, "W" if won else "L", opponent_name, score
+
+
+@app.route('/year/<int:year>/bracket')
+def year_bracket(year):
+    """
+    Every game of a year's bracket, level by level, as text (default) or JSON (?format=json)
+     - streamed one level at a time on first use, later requests get the cached bytes
+    :return:
+    """
+    fmt = request.args.get("format", "text")
+    if fmt not in BRACKET_FORMATS:
+        abort(400)
+    tournament = store.get_store()
+    graph = tournament.graphs.get(year)
+    if graph is None:
+        abort(404)
+    key = (tournament.version, year, fmt)
+    content = bracket_cache.get(key)
+    if content is not None:
+        return Response(content, mimetype=BRACKET_FORMATS[fmt])
+
+    def stream_bracket():
+        chunks = []
+        for chunk in (graph.iter_json() if fmt == "json" else graph.iter_text()):
+            encoded = chunk.encode("utf-8")
+            chunks.append(encoded)
+            yield encoded
+        bracket_cache.put(key, b"".join(chunks))  # only reached if the whole bracket was sent
+
+    return Response(stream_bracket(), mimetype=BRACKET_FORMATS[fmt])
 
 
 @app.route('/seed', methods=['GET', 'POST'])
@@ -71,10 +200,40 @@ def seed_form():
 
 @app.route('/seed/result/<seed>')
 def search_by_seed(seed):
+    key = ("seed", store.get_store().version, int(seed))
+    page = page_cache.get(key)
+    if page is None:
+        results = search.search_for_seed(int(seed))
+        best_round, best_teams, other_results = format_seed_results(results)
+        with metrics.stage("render"):
+            page = render_template("seed_result.html", seed=int(seed), best_round=best_round, best_teams=best_teams, other_results=other_results)
+        page_cache.put(key, page)
+    return page
+
+
+@app.route('/seed/summary')
+def seed_summary():
+    """
+    Overview of the best results for all 16 seeds, from a single batch search
+    :return:
+    """
+    summary = []
+    for seed, results in search.search_for_seeds().items():
+        best_round, best_teams, _ = format_seed_results(results)
+        summary.append((seed, best_round, best_teams))
+    with metrics.stage("render"):
+        return render_template("seed_summary.html", summary=summary)
+
+
+def format_seed_results(results: dict) -> tuple:
+    """
+    Formats seed search results for display
+    :param results: dict(best_result_by_round: team: [year])
+    :return: tuple(best_round: str, best_teams: [(team, years)], other_results: [(round, [(team, years)])])
+    """
     best_round = "1000"
     best_teams = []
     other_results = []
-    results = search.search_for_seed(int(seed))
     sorted_keys = sorted(results.keys())  # sort low -> high (best -> worst finishes)
     counter = 0
     if len(sorted_keys) > 1:  # at least one team has won a game
@@ -95,4 +254,4 @@ def search_by_seed(seed):
                         running_ls.append(t)
                     other_results.append((format_round, running_ls))
             counter += 1
-    return render_template("seed_result.html", seed=seed, best_round=best_round, best_teams=best_teams, other_results=other_results)
\ No newline at end of file
+    return best_round, best_teams, other_results
@@ -0,0 +1,22 @@
+"""
+ASGI entry point, e.g. `uvicorn march_madness.web.asgi:asgi_app`
+ - the JSON API (/api/...) is answered natively on the event loop by api.asgi_api, straight from the in-memory store,
+   so slow clients polling it only hold their own connection, never a thread
+ - every other route goes through asgiref's WsgiToAsgi, which runs Flask on ONE shared thread (& blocks it while a
+   response drains), so the HTML pages are better served by a threaded WSGI server, e.g.
+   `gunicorn --threads 8 march_madness.web.app:app`
+"""
+
+from asgiref.wsgi import WsgiToAsgi
+
+from .api import api, asgi_api
+from .app import app
+
+wsgi_app = WsgiToAsgi(app)
+
+
+async def asgi_app(scope, receive, send):
+    if scope["type"] == "http" and scope["path"].startswith(f"{api.url_prefix}/"):
+        await asgi_api(scope, receive, send)
+    else:
+        await wsgi_app(scope, receive, send)